@@ -7,7 +7,7 @@ locations to be overridden.
 """
 
 import logging
-from utils.logging_helper import setup_logging, operation_counts
+from utils.logging_helper import setup_logging, flush_counts
 import time
 import json
 import sys
@@ -90,7 +90,10 @@ class OperationsDBImporter(BaseDBImporter):
                 ]
         
         for step in self.safe_tqdm(steps, desc="SQL Script Progress", unit="step"):
-            run_sql_step(conn, step['name'], step['sql'], timeout=self.config['sql_timeout'])
+            run_sql_step(
+                conn, step['name'], step['sql'],
+                timeout=self.config['sql_timeout'], keep_results=False,
+            )
             conn.commit()
         
         logger.info("All Staging steps completed successfully. Document Conversion Scope Defined.")
@@ -118,10 +121,11 @@ def main():
     load_dotenv()
     importer = OperationsDBImporter()
     importer.run()
+    counts = flush_counts()
     logger.info(
         "Run completed - successes: %s failures: %s",
-        operation_counts["success"],
-        operation_counts["failure"],
+        counts["success"],
+        counts["failure"],
     )
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ whether empty tables are processed.
 """
 
 import logging
-from utils.logging_helper import setup_logging, operation_counts
+from utils.logging_helper import setup_logging, flush_counts
 import time
 import json
 import sys
@@ -89,7 +89,10 @@ class FinancialDBImporter(BaseDBImporter):
                 ]
         
         for step in self.safe_tqdm(steps, desc="SQL Script Progress", unit="step"):
-            run_sql_step(conn, step['name'], step['sql'], timeout=self.config['sql_timeout'])
+            run_sql_step(
+                conn, step['name'], step['sql'],
+                timeout=self.config['sql_timeout'], keep_results=False,
+            )
             conn.commit()
         
         logger.info("All Staging steps completed successfully. Supervision Scope Defined.")
@@ -117,10 +120,11 @@ def main():
     load_dotenv()
     importer = FinancialDBImporter()
     importer.run()
+    counts = flush_counts()
     logger.info(
         "Run completed - successes: %s failures: %s",
-        operation_counts["success"],
-        operation_counts["failure"],
+        counts["success"],
+        counts["failure"],
     )
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ batch size.
 """
 
 import logging
-from utils.logging_helper import setup_logging, operation_counts
+from utils.logging_helper import setup_logging, flush_counts
 import time
 import json
 import os
@@ -24,8 +24,12 @@ from tkinter import messagebox
 from config import settings, ETLConstants
 
 from utils.etl_helpers import (
+    configure_connection,
+    execute_many_with_timeout,
+    execute_sql_with_timeout,
     log_exception_to_file,
     load_sql,
+    run_sql_step,
     run_sql_step_with_retry,
     run_sql_script,
 )
@@ -104,17 +108,22 @@ def load_config(config_file=None):
         "batch_size": ETLConstants.DEFAULT_BULK_INSERT_BATCH_SIZE,
     }
     
-    if config_file and os.path.exists(config_file):
+    if config_file:
         try:
-            with open(config_file, 'r') as f:
+            with open(config_file, 'r', encoding='utf-8') as f:
                 file_config = json.load(f)
                 config.update(file_config)
             logger.info(f"Loaded configuration from {config_file}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error loading config file: {e}")
     
     return config
 
+# Column order of the catalog query in gather_lob_columns
+LOB_CATALOG_COLUMNS = ("SchemaName", "TableName", "ColumnName", "DataType", "CurrentLength", "RowCnt")
+
 def get_max_length(
     conn,
     schema,
@@ -124,23 +133,22 @@ def get_max_length(
     timeout=ETLConstants.DEFAULT_SQL_TIMEOUT,
 ):
     """Determine the maximum length needed for a text/varchar column."""
-    with conn.cursor() as cursor:
-        try:
-            if datatype.lower() in ('varchar', 'nvarchar'):
-                sql = f"SELECT MAX(LEN([{column}])) FROM [{schema}].[{table}]"
-            elif datatype.lower() in ('text', 'ntext'):
-                # For text/ntext, cast to nvarchar(max) for LEN
-                sql = f"SELECT MAX(LEN(CAST([{column}] AS NVARCHAR(MAX)))) FROM [{schema}].[{table}]"
-            else:
-                return None
-
-            cursor.execute(sql, timeout=timeout)
-            result = cursor.fetchone()
-            return result[0] if result and result[0] is not None else 0
-        except Exception as e:
-            logger.error(f"Error getting max length for {schema}.{table}.{column}: {e}")
+    try:
+        if datatype.lower() in ('varchar', 'nvarchar'):
+            sql = f"SELECT MAX(LEN([{column}])) FROM [{schema}].[{table}]"
+        elif datatype.lower() in ('text', 'ntext'):
+            # For text/ntext, cast to nvarchar(max) for LEN
+            sql = f"SELECT MAX(LEN(CAST([{column}] AS NVARCHAR(MAX)))) FROM [{schema}].[{table}]"
+        else:
             return None
 
+        # run_sql_step fetches before it commits; a commit closes open cursors
+        rows = run_sql_step(conn, f"Max length {schema}.{table}.{column}", sql, timeout=timeout)
+        return rows[0][0] if rows and rows[0][0] is not None else 0
+    except Exception as e:
+        logger.error(f"Error getting max length for {schema}.{table}.{column}: {e}")
+        return None
+
 def build_alter_column_sql(schema, table, column, datatype, max_length):
     """Build the SQL statement to alter a column based on its max length."""
     if max_length is None or max_length == 0:
@@ -157,12 +165,41 @@ def create_lob_tracking_table(conn, config):
     run_sql_script(conn, 'gather_lobs', gather_lobs_sql, timeout=config['sql_timeout'])
     logger.info("LOB tracking table created successfully")
 
+def insert_lob_rows(conn, insert_sql, rows, timeout, log_file):
+    """Insert catalog rows in one batch, falling back to one row at a time.
+
+    Returns the number of rows committed.  If the batch fails it is rolled
+    back and each row is retried on its own, so one bad row only loses
+    itself and is logged with its column name.
+    """
+    try:
+        execute_many_with_timeout(conn, insert_sql, rows, timeout=timeout)
+        conn.commit()
+        return len(rows)
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"Batch insert of {len(rows)} LOB columns failed, retrying row by row: {e}")
+
+    inserted = 0
+    for row in rows:
+        try:
+            execute_sql_with_timeout(conn, insert_sql, row, timeout=timeout)
+            conn.commit()
+            inserted += 1
+        except Exception as e:
+            conn.rollback()
+            error_msg = f"Error cataloging LOB column {row[0]}.{row[1]}.{row[2]}: {e}"
+            logger.error(error_msg)
+            log_exception_to_file(error_msg, log_file)
+    return inserted
+
 def gather_lob_columns(conn, config, log_file):
     """Gather information about LOB columns and determine optimal sizes."""
     logger.info("Gathering information about LOB columns")
     
-    with conn.cursor() as cursor:
-        cursor.execute("""
+    # The catalog is only metadata, so it is read in full before any
+    # per-column query runs on the same connection (no MARS needed)
+    catalog = run_sql_step(conn, "Gather LOB columns", f"""
         SELECT
             s.[NAME] AS SchemaName,
             t.[NAME] AS TableName,
@@ -183,101 +220,88 @@ def gather_lob_columns(conn, config, log_file):
                 AND (c.max_length > 5000 OR c.max_length=-1))
         )
         ORDER BY s.[NAME], t.[NAME], c.[NAME]
-        """, timeout=config['sql_timeout'])
-
-        columns = [desc[0] for desc in cursor.description]
+    """, timeout=config['sql_timeout']) or []
 
-        batch_size = config.get(
-            'batch_size', ETLConstants.DEFAULT_BULK_INSERT_BATCH_SIZE
-        )
-        processed = 0
-        progress = tqdm(desc="Analyzing LOB Columns", unit="column")
-
-        with conn.cursor() as update_cursor:
-            while True:
-                rows = cursor.fetchmany(batch_size)
-                if not rows:
-                    break
-                for row in rows:
-                    row_dict = dict(zip(columns, row))
-                    schema_name = row_dict.get('SchemaName')
-                    table_name = row_dict.get('TableName')
-                    column_name = row_dict.get('ColumnName')
-                    datatype = row_dict.get('DataType')
-                    row_cnt = row_dict.get('RowCnt') or 0
-
-                    if not config['include_empty_tables'] and row_cnt <= 0:
-                        logger.info(f"Skipping {schema_name}.{table_name}.{column_name}: row count is {row_cnt}")
-                        continue
-
-                    try:
-                        max_length = get_max_length(conn, schema_name, table_name, column_name, datatype, config['sql_timeout'])
-                        alter_column_sql = build_alter_column_sql(schema_name, table_name, column_name, datatype, max_length)
-
-                        insert_sql = f"""
-                            INSERT INTO {DB_NAME}.dbo.LOB_COLUMN_UPDATES
-                            (SchemaName, TableName, ColumnName, DataType, CurrentLength, RowCnt, MaxLen, AlterStatement)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """
-                        update_cursor.execute(
-                            insert_sql,
-                            (
-                                schema_name,
-                                table_name,
-                                column_name,
-                                datatype,
-                                row_dict.get('CurrentLength'),
-                                row_cnt,
-                                max_length,
-                                alter_column_sql
-                            ),
-                            timeout=config['sql_timeout']
-                        )
-                        conn.commit()
-
-                    except Exception as e:
-                        error_msg = f"Error processing LOB column {schema_name}.{table_name}.{column_name}: {e}"
-                        logger.error(error_msg)
-                        log_exception_to_file(error_msg, log_file)
-
-                    processed += 1
-                    progress.update(1)
-
-        progress.close()
-        logger.info(f"Analyzed and cataloged {processed} LOB columns")
+    batch_size = config.get(
+        'batch_size', ETLConstants.DEFAULT_BULK_INSERT_BATCH_SIZE
+    )
+    processed = 0
+    progress = tqdm(desc="Analyzing LOB Columns", unit="column")
+
+    insert_sql = f"""
+        INSERT INTO {DB_NAME}.dbo.LOB_COLUMN_UPDATES
+        (SchemaName, TableName, ColumnName, DataType, CurrentLength, RowCnt, MaxLen, AlterStatement)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    for start in range(0, len(catalog), batch_size):
+        # Columns of each batch are inserted together in one round trip
+        pending = []
+        for row in catalog[start:start + batch_size]:
+            row_dict = dict(zip(LOB_CATALOG_COLUMNS, row))
+            schema_name = row_dict.get('SchemaName')
+            table_name = row_dict.get('TableName')
+            column_name = row_dict.get('ColumnName')
+            datatype = row_dict.get('DataType')
+            row_cnt = row_dict.get('RowCnt') or 0
+
+            if not config['include_empty_tables'] and row_cnt <= 0:
+                logger.info(f"Skipping {schema_name}.{table_name}.{column_name}: row count is {row_cnt}")
+                continue
+
+            try:
+                max_length = get_max_length(conn, schema_name, table_name, column_name, datatype, config['sql_timeout'])
+                alter_column_sql = build_alter_column_sql(schema_name, table_name, column_name, datatype, max_length)
+                pending.append((
+                    schema_name,
+                    table_name,
+                    column_name,
+                    datatype,
+                    row_dict.get('CurrentLength'),
+                    row_cnt,
+                    max_length,
+                    alter_column_sql
+                ))
+
+            except Exception as e:
+                error_msg = f"Error processing LOB column {schema_name}.{table_name}.{column_name}: {e}"
+                logger.error(error_msg)
+                log_exception_to_file(error_msg, log_file)
+
+            progress.update(1)
+
+        if pending:
+            processed += insert_lob_rows(conn, insert_sql, pending, config['sql_timeout'], log_file)
+
+    progress.close()
+    logger.info(f"Analyzed and cataloged {processed} LOB columns")
 
 def execute_lob_column_updates(conn, config, log_file):
     """Execute the ALTER statements to optimize LOB columns."""
     logger.info("Executing ALTER TABLE statements for LOB columns")
     
-    with conn.cursor() as cursor:
-        cursor.execute(f"""
+    rows = run_sql_step(conn, "Gather LOB alter statements", f"""
         SELECT REPLACE(S.ALTERSTATEMENT,' NULL',';') AS Alter_Statement
         FROM {DB_NAME}.dbo.LOB_COLUMN_UPDATES S
         WHERE S.TABLENAME NOT LIKE '%LOB_COL%'
         ORDER BY S.MAXLEN DESC
-    """, timeout=config['sql_timeout'])
-
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-
-        for idx, row in enumerate(tqdm(rows, desc="Optimizing LOB Columns", unit="column"), 1):
-            row_dict = dict(zip(columns, row))
-            alter_sql = row_dict.get('Alter_Statement')
-
-            if alter_sql:
-                try:
-                    run_sql_step_with_retry(
-                        conn,
-                        f"Alter Column {idx}",
-                        alter_sql,
-                        timeout=config['sql_timeout'],
-                    )
-                    conn.commit()
-                except Exception as e:
-                    error_msg = f"Failed to alter column (statement {idx}): {e}"
-                    logger.error(error_msg)
-                    log_exception_to_file(error_msg, log_file)
+    """, timeout=config['sql_timeout']) or []
+
+    for idx, row in enumerate(tqdm(rows, desc="Optimizing LOB Columns", unit="column"), 1):
+        alter_sql = row[0]
+
+        if alter_sql:
+            try:
+                run_sql_step_with_retry(
+                    conn,
+                    f"Alter Column {idx}",
+                    alter_sql,
+                    timeout=config['sql_timeout'],
+                )
+                conn.commit()
+            except Exception as e:
+                error_msg = f"Failed to alter column (statement {idx}): {e}"
+                logger.error(error_msg)
+                log_exception_to_file(error_msg, log_file)
 
     logger.info(f"Completed optimizing {len(rows)} LOB columns")
 
@@ -334,6 +358,8 @@ def main():
         # Begin database operations
         try:
             with get_target_connection() as conn:
+                configure_connection(conn, config['sql_timeout'])
+
                 # Step 1: Create tracking table for LOB columns
                 create_lob_tracking_table(conn, config)
                 
@@ -345,10 +371,11 @@ def main():
                 
                 # Step 4: Show completion message
                 show_completion_message()
+                counts = flush_counts()
                 logger.info(
                     "Run completed - successes: %s failures: %s",
-                    operation_counts["success"],
-                    operation_counts["failure"],
+                    counts["success"],
+                    counts["failure"],
                 )
                 
         except Exception as e:
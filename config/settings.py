@@ -46,3 +46,9 @@ class ETLConstants:
     #: Default connection timeout when establishing database connections
     CONNECTION_TIMEOUT = 30
 
+    #: Number of rows fetched per round trip when reading result sets
+    FETCH_BATCH_SIZE = 1000
+
+    #: Number of parameter sets sent per round trip by executemany
+    EXECUTEMANY_BATCH_SIZE = 1000
+
@@ -15,6 +15,7 @@ from sqlalchemy.types import Text
 
 from db.mssql import get_target_connection
 from utils.etl_helpers import (
+    configure_connection,
     load_sql,
     run_sql_script,
     log_exception_to_file,
@@ -32,6 +33,18 @@ from config import ETLConstants
 
 logger = logging.getLogger(__name__)
 
+# Hidden Tk root shared by every message box shown from this module.
+_hidden_root: Optional[tk.Tk] = None
+
+
+def _get_hidden_root() -> tk.Tk:
+    """Return the hidden Tk root used as dialog parent, creating it on first use."""
+    global _hidden_root
+    if _hidden_root is None:
+        _hidden_root = tk.Tk()
+        _hidden_root.withdraw()  # Hide the main window
+    return _hidden_root
+
 class BaseDBImporter:
     """Base class for database import operations."""
     
@@ -328,23 +341,23 @@ class BaseDBImporter:
 
         logger.info(f"All Primary Key/NOT NULL statements executed FOR THE {self.DB_TYPE} DATABASE.")
 
+    def configure_target_connection(self, conn: Any) -> None:
+        """Apply session settings such as the lock timeout once per connection."""
+        configure_connection(conn, self.config['sql_timeout'])
+
     def show_completion_message(self, next_step_name: Optional[str] = None) -> bool:
         """Show a message box indicating completion and asking to continue."""
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
+        root = _get_hidden_root()
         
         message = f"{self.DB_TYPE} database migration is complete.\n\n"
         message += f"You may now drop the {self.DB_TYPE} database if desired.\n\n"
         
         if next_step_name:
             message += f"Click Yes to proceed to {next_step_name}, or No to stop."
-            proceed = messagebox.askyesno(f"{self.DB_TYPE} DB Migration Complete", message)
-            root.destroy()
-            return proceed
+            return messagebox.askyesno(f"{self.DB_TYPE} DB Migration Complete", message, parent=root)
         else:
             message += "Click OK to continue."
-            messagebox.showinfo(f"{self.DB_TYPE} DB Migration Complete", message)
-            root.destroy()
+            messagebox.showinfo(f"{self.DB_TYPE} DB Migration Complete", message, parent=root)
             return False
 
     def run(self) -> bool:
@@ -365,6 +378,8 @@ class BaseDBImporter:
 
             # Begin database operations
             with get_target_connection() as target_conn:
+                self.configure_target_connection(target_conn)
+
                 # Execute specific pre-processing steps
                 self.execute_preprocessing(target_conn)
                 
@@ -408,10 +423,11 @@ class BaseDBImporter:
             
             # Try to show error message box
             try:
-                root = tk.Tk()
-                root.withdraw()
-                messagebox.showerror("ETL Script Error", f"An error occurred:\n\n{error_details}")
-                root.destroy()
+                messagebox.showerror(
+                    "ETL Script Error",
+                    f"An error occurred:\n\n{error_details}",
+                    parent=_get_hidden_root(),
+                )
             except Exception as msgbox_exc:
                 logger.error(f"Failed to show error message box: {msgbox_exc}")
             
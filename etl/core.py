@@ -77,12 +77,14 @@ def load_config(config_file=None, default_config=None):
     """Load configuration from JSON file if provided, otherwise use defaults."""
     config = default_config or {}
     
-    if config_file and os.path.exists(config_file):
+    if config_file:
         try:
             with open(config_file, 'r', encoding='utf-8') as f:
                 file_config = json.load(f)
                 config.update(file_config)
             logger.info(f"Loaded configuration from {config_file}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error loading config file: {e}")
     
@@ -1,4 +1,4 @@
-"""Graphical wrapper to run the ETL scripts sequentially.
+"""Graphical wrapper to run the ETL scripts.
 
 This module provides a small Tk based application that builds a SQL Server
 connection string and launches each of the ETL scripts.  It can also be used in
@@ -7,32 +7,42 @@ dictionary.  The UI exposes the most common configuration options such as the
 CSV directory and whether empty tables should be processed.
 """
 
+import asyncio
 import os
 import sys
 import json
 import logging
-from utils.logging_helper import setup_logging, operation_counts
+from utils.logging_helper import setup_logging
 logger = logging.getLogger(__name__)
-import subprocess
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, filedialog
 import pyodbc
 import re
-import threading
 import queue
 import time
 from datetime import datetime
+from functools import lru_cache
 
-SCRIPTS = [
-    ("Justice DB Import", "01_JusticeDB_Import.py"),
-    ("Operations DB Import", "02_OperationsDB_Import.py"),
-    ("Financial DB Import", "03_FinancialDB_Import.py"),
-    ("LOB Column Processing", "04_LOBColumns.py"),
-]
+# Script path -> description, in the order they are listed in the UI.
+SCRIPTS = {
+    "01_JusticeDB_Import.py": "Justice DB Import",
+    "02_OperationsDB_Import.py": "Operations DB Import",
+    "03_FinancialDB_Import.py": "Financial DB Import",
+    "04_LOBColumns.py": "LOB Column Processing",
+}
 
 # Use an absolute path so the helper works regardless of the current
 # working directory.
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config", "values.json")
+
+# Longest single line of child output accepted by the stream reader.  SQL
+# statements echoed in error messages can easily exceed asyncio's 64 KiB
+# default.
+STREAM_LINE_LIMIT = 1024 * 1024
+
+# Scripts allowed to run at once from the UI.  They mostly wait on SQL Server,
+# so a few in parallel overlap that latency; the rest wait for a free slot.
+MAX_CONCURRENT_SCRIPTS = min(len(SCRIPTS), os.cpu_count() or 1)
 # Add this code to run_etl.py to make it work with our new modular structure
 
 def run_sequential_etl(env):
@@ -65,133 +75,172 @@ def run_sequential_etl(env):
         os.environ.clear()
         os.environ.update(old_environ)
 
-class ScriptRunner(threading.Thread):
-    """Thread class to run scripts without blocking the UI."""
-    
-    def __init__(self, script_path, env, output_queue, status_queue):
-        super().__init__(daemon=True)
-        self.script_path = script_path
-        self.env = env
-        self.output_queue = output_queue
-        self.status_queue = status_queue
-        self.process = None
-        self._stop_event = threading.Event()
-        
-    def run(self):
-        """Run the script and send output to queues."""
-        debug_log_path = f"{self.script_path}_debug.log"
-        
-        try:
-            # Start the subprocess
-            self.process = subprocess.Popen(
-                [sys.executable, "-u", self.script_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                bufsize=0,  # Unbuffered
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                env=self.env
-            )
-            
-            # Send initial status
-            self.status_queue.put(("status", "Starting..."))
-            
-            with open(debug_log_path, "w", encoding="utf-8") as debug_log:
-                line_count = 0
-                last_ui_update = time.time()
-                
-                # Read output line by line
-                while not self._stop_event.is_set():
-                    line = self.process.stdout.readline()
-                    
-                    if not line:
-                        # Check if process has terminated
-                        if self.process.poll() is not None:
-                            break
-                        continue
-                    
-                    # Always write to debug log
-                    debug_log.write(line)
+@lru_cache(maxsize=8)
+def _format_conn_str(driver, server, database, user, password):
+    """Return the ODBC connection string for the given field values."""
+    pairs = (
+        ("DRIVER", driver or "{ODBC Driver 17 for SQL Server}"),
+        ("SERVER", server),
+        ("DATABASE", database),
+        ("UID", user),
+        ("PWD", password),
+    )
+    # DRIVER and SERVER are always included, the rest only when set
+    return ";".join(
+        f"{key}={value}" for key, value in pairs if value or key in ("DRIVER", "SERVER")
+    )
+
+
+async def run_script_async(script_path, env, output_queue, status_queue, slots=None):
+    """Run ``script_path`` in a child interpreter and stream its output to the queues.
+
+    The coroutine is scheduled on the application's event loop, which is
+    pumped from the Tk main loop, so several scripts may run concurrently
+    without any extra threads.  When ``slots`` is an :class:`asyncio.Semaphore`
+    the child is only started once a slot is free.  Status and completion
+    messages are tagged with ``script_path`` so the UI can route them.
+    Cancelling the task, or an error while reading its output, terminates
+    the child process.
+    """
+    debug_log_path = f"{script_path}_debug.log"
+    process = None
+    acquired = False
+
+    try:
+        if slots is not None:
+            if slots.locked():
+                status_queue.put((script_path, "Queued"))
+            await slots.acquire()
+            acquired = True
+
+        # Start the subprocess
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-u", script_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=env,
+            limit=STREAM_LINE_LIMIT,
+        )
+
+        # Send initial status
+        status_queue.put((script_path, "Starting..."))
+
+        with open(debug_log_path, "w", encoding="utf-8") as debug_log:
+            line_count = 0
+            last_ui_update = time.time()
+            # Lines read since the last UI update; sent as one chunk so no
+            # output is lost between updates
+            pending = []
+
+            # Read output line by line until the child closes stdout
+            async for raw_line in process.stdout:
+                line = raw_line.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+                # Always write to debug log; it is flushed with each UI update
+                debug_log.write(line)
+
+                line_count += 1
+                pending.append(line)
+
+                # Parse status information from the line
+                status = _parse_status(line)
+                if status:
+                    status_queue.put((script_path, status))
+
+                # Send output to UI periodically or for important updates
+                current_time = time.time()
+                if (current_time - last_ui_update > 0.1 or  # Update every 100ms
+                    "Drop If Exists" in line or
+                    "Select INTO" in line or
+                    "Error" in line or
+                    "ERROR" in line or
+                    line_count <= 10):  # Always show first 10 lines
+
+                    output_queue.put(("output", "".join(pending)))
+                    pending.clear()
                     debug_log.flush()
-                    
-                    line_count += 1
-                    
-                    # Parse status information from the line
-                    self._parse_status(line)
-                    
-                    # Send lines to UI periodically or for important updates
-                    current_time = time.time()
-                    if (current_time - last_ui_update > 0.1 or  # Update every 100ms
-                        "Drop If Exists" in line or 
-                        "Select INTO" in line or 
-                        "Error" in line or 
-                        "ERROR" in line or
-                        line_count <= 10):  # Always show first 10 lines
-                        
-                        self.output_queue.put(("output", line))
-                        last_ui_update = current_time
-                    
-                    # For very verbose output, send periodic summaries
-                    if line_count % 100 == 0:
-                        summary = f"[{datetime.now().strftime('%H:%M:%S')}] Processed {line_count} lines...\n"
-                        self.output_queue.put(("output", summary))
-            
-            # Wait for process completion
-            return_code = self.process.wait()
-            
-            # Send completion status
-            if return_code != 0:
-                self.output_queue.put(("output", f"\nProcess exited with return code {return_code}\n"))
-                self.status_queue.put(("status", f"FAILED (code {return_code})"))
-            else:
-                self.status_queue.put(("status", "COMPLETED"))
-                
-            self.output_queue.put(("output", f"\nFinished {self.script_path}\nDebug log: {debug_log_path}\n"))
-            
-        except Exception as e:
-            error_msg = f"Error running {self.script_path}: {str(e)}\n"
-            self.output_queue.put(("output", error_msg))
-            self.status_queue.put(("status", "EXECUTION ERROR"))
-            logger.error(error_msg)
-        finally:
-            # Signal completion
-            self.output_queue.put(("done", None))
-    
-    def _parse_status(self, line):
-        """Extract status information from output line."""
-        try:
-            if "Drop If Exists" in line:
-                match = re.search(r"RowID:(\d+) Drop If Exists:\((.*?)\)", line)
-                if match:
-                    row_id, table_info = match.groups()
-                    self.status_queue.put(("status", f"Dropping: {table_info}"))
-            elif "Select INTO" in line:
-                match = re.search(r"RowID:(\d+) Select INTO:\((.*?)\)", line)
-                if match:
-                    row_id, table_info = match.groups()
-                    self.status_queue.put(("status", f"Creating: {table_info}"))
-            elif "PK Creation" in line:
-                match = re.search(r"PK Creation:\((.*?)\)", line)
-                if match:
-                    table_info = match.group(1)
-                    self.status_queue.put(("status", f"Creating PK: {table_info}"))
-            elif "Gathering" in line:
-                self.status_queue.put(("status", line.strip()))
-            elif "completed successfully" in line:
-                self.status_queue.put(("status", "Processing..."))
-        except Exception:
-            # Don't let parsing errors disrupt the process
-            pass
-    
-    def stop(self):
-        """Stop the thread and subprocess."""
-        self._stop_event.set()
-        if self.process and self.process.poll() is None:
-            self.process.terminate()
-            self.process.wait()
+                    last_ui_update = current_time
+
+            if pending:
+                output_queue.put(("output", "".join(pending)))
+
+        # Wait for process completion
+        return_code = await process.wait()
+
+        # Send completion status
+        if return_code != 0:
+            output_queue.put(("output", f"\nProcess exited with return code {return_code}\n"))
+            status_queue.put((script_path, f"FAILED (code {return_code})"))
+        else:
+            status_queue.put((script_path, "COMPLETED"))
+
+        output_queue.put(("output", f"\nFinished {script_path}\nDebug log: {debug_log_path}\n"))
+
+    except asyncio.CancelledError:
+        status_queue.put((script_path, "STOPPED"))
+        raise
+    except Exception as e:
+        error_msg = f"Error running {script_path}: {str(e)}\n"
+        output_queue.put(("output", error_msg))
+        status_queue.put((script_path, "EXECUTION ERROR"))
+        logger.error(error_msg)
+    finally:
+        # A child left running after cancellation or a read error (such as a
+        # line over STREAM_LINE_LIMIT) would block on a full pipe forever
+        if process is not None and process.returncode is None:
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+        if acquired:
+            slots.release()
+        # Signal completion
+        output_queue.put(("done", script_path))
+
+
+def _parse_status(line):
+    """Extract status information from an output line, or return ``None``."""
+    try:
+        if "Drop If Exists" in line:
+            match = re.search(r"RowID:(\d+) Drop If Exists:\((.*?)\)", line)
+            if match:
+                row_id, table_info = match.groups()
+                return f"Dropping: {table_info}"
+        elif "Select INTO" in line:
+            match = re.search(r"RowID:(\d+) Select INTO:\((.*?)\)", line)
+            if match:
+                row_id, table_info = match.groups()
+                return f"Creating: {table_info}"
+        elif "PK Creation" in line:
+            match = re.search(r"PK Creation:\((.*?)\)", line)
+            if match:
+                table_info = match.group(1)
+                return f"Creating PK: {table_info}"
+        elif "Gathering" in line:
+            return line.strip()
+        elif "completed successfully" in line:
+            return "Processing..."
+    except Exception:
+        # Don't let parsing errors disrupt the process
+        pass
+    return None
+
+
+async def _cancel_running_scripts(tasks):
+    """Cancel the given script tasks and wait for them to exit."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 class App(tk.Tk):
+    #: Lines kept in the output pane; older lines are discarded so inserts and
+    #: redraws stay cheap during long runs (the full log is in the debug file).
+    MAX_OUTPUT_LINES = 5000
+
+    #: Interval in milliseconds between passes of the script event loop.
+    EVENT_LOOP_INTERVAL_MS = 20
+
     def __init__(self):
         """Initialize the main application window and start queue processing."""
         super().__init__()
@@ -199,11 +248,16 @@ class App(tk.Tk):
         self.resizable(True, True)
         self.minsize(900, 700)  # Increased height for better visibility
         self.conn_str = None
+        self._conn = None
+        self._child_env = None
         self.csv_dir = ""
         self.config_values = self._load_config()
         self._create_connection_widgets()
         self.status_labels = {}
-        self.current_runner = None
+        self.running_scripts = {}
+        self._loop = None
+        self._loop_pump_id = None
+        self._script_slots = None
         self.update_queue = queue.Queue()
         self.status_queue = queue.Queue()
         
@@ -228,9 +282,10 @@ class App(tk.Tk):
     def _load_config(self):
         """Load configuration from JSON file if it exists"""
         try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r') as f:
-                    return json.load(f)
+            with open(CONFIG_FILE, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error loading config: {e}")
         return {
@@ -292,12 +347,34 @@ class App(tk.Tk):
 
         # checkbox to include empty tables
         self.include_empty_var = tk.BooleanVar(value=self.config_values.get("include_empty_tables", False))
+        # Keep INCLUDE_EMPTY_TABLES in sync with the checkbox for the scripts
+        self.include_empty_var.trace_add("write", self._export_include_empty)
+        self._export_include_empty()
         chk = tk.Checkbutton(self, text="Include empty tables", variable=self.include_empty_var)
         chk.grid(row=row+1, column=0, columnspan=2, pady=(5, 0))
 
         test_btn = tk.Button(self, text="Test Connection", command=self.test_connection)
         test_btn.grid(row=row+2, column=0, columnspan=2, pady=10)
     
+    def _export_include_empty(self, *_):
+        """Mirror the "Include empty tables" checkbox into ``INCLUDE_EMPTY_TABLES``."""
+        os.environ["INCLUDE_EMPTY_TABLES"] = "1" if self.include_empty_var.get() else "0"
+        self._child_env = None
+
+    def _child_environment(self):
+        """Return the environment passed to every ETL script.
+
+        The mapping is built once and shared by all launches; it is rebuilt
+        only after the application changes ``os.environ``.
+        """
+        if self._child_env is None:
+            self._child_env = {
+                **os.environ,
+                "PYTHONUNBUFFERED": "1",
+                "PYTHONIOENCODING": "utf-8",
+            }
+        return self._child_env
+
     def _browse_csv_dir(self):
         """Open a directory chooser dialog and store the selected path."""
         directory = filedialog.askdirectory()
@@ -309,15 +386,9 @@ class App(tk.Tk):
         if hasattr(self, "script_frame"):
             return
 
+        # The frame is only placed on the window once all of its children
+        # exist so the geometry manager lays it out in a single pass.
         self.script_frame = tk.Frame(self)
-        start_row = len(self.entries) + 3
-        self.script_frame.grid(row=start_row, column=0, columnspan=3, sticky="nsew")
-        
-        # Configure row and column weights to allow expansion
-        self.grid_rowconfigure(start_row, weight=1)
-        self.grid_columnconfigure(0, weight=1)
-        self.grid_columnconfigure(1, weight=1)
-        self.grid_columnconfigure(2, weight=1)
 
         # Add column headers
         tk.Label(self.script_frame, text="Script", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky="w", padx=5, pady=2)
@@ -325,7 +396,7 @@ class App(tk.Tk):
         tk.Label(self.script_frame, text="Current Status", font=("Arial", 10, "bold")).grid(row=0, column=2, sticky="w", padx=5, pady=2)
 
         self.run_buttons = {}
-        for idx, (label, path) in enumerate(SCRIPTS, 1):
+        for idx, path in enumerate(SCRIPTS, 1):
             tk.Label(self.script_frame, text=path).grid(row=idx, column=0, sticky="w", padx=5, pady=2)
             
             # Store button reference so we can disable/enable it
@@ -345,14 +416,15 @@ class App(tk.Tk):
             self.status_labels[path] = status_var
             
         # Configure grid for output text to expand
-        self.script_frame.grid_rowconfigure(len(SCRIPTS)+1, weight=1)
+        output_row = len(SCRIPTS) + 1
+        self.script_frame.grid_rowconfigure(output_row, weight=1)
         self.script_frame.grid_columnconfigure(0, weight=1)
         self.script_frame.grid_columnconfigure(1, weight=1)
         self.script_frame.grid_columnconfigure(2, weight=1)
 
         # Create output text area with auto-scroll checkbox
         output_frame = tk.Frame(self.script_frame)
-        output_frame.grid(row=len(SCRIPTS)+1, column=0, columnspan=3, sticky="nsew", pady=(10, 0))
+        output_frame.grid(row=output_row, column=0, columnspan=3, sticky="nsew", pady=(10, 0))
         output_frame.grid_rowconfigure(0, weight=1)
         output_frame.grid_columnconfigure(0, weight=1)
         
@@ -372,23 +444,23 @@ class App(tk.Tk):
         
         # Add timestamp to output
         self.output_text.insert(tk.END, f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Ready to run scripts.\n\n")
+
+        start_row = len(self.entries) + 3
+        self.script_frame.grid(row=start_row, column=0, columnspan=3, sticky="nsew")
+
+        # Configure row and column weights to allow expansion
+        self.grid_rowconfigure(start_row, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_columnconfigure(2, weight=1)
     
     def _build_conn_str(self):
         """Assemble a SQL Server ODBC connection string from the entry values."""
-        driver = self.entries["driver"].get() or "{ODBC Driver 17 for SQL Server}"
-        server = self.entries["server"].get()
-        database = self.entries["database"].get()
-        user = self.entries["user"].get()
-        password = self.entries["password"].get()
-
-        parts = [f"DRIVER={driver}", f"SERVER={server}"]
-        if database:
-            parts.append(f"DATABASE={database}")
-        if user:
-            parts.append(f"UID={user}")
-        if password:
-            parts.append(f"PWD={password}")
-        return ";".join(parts)
+        # Read every entry once; each Entry.get() is a round trip into Tcl
+        values = {key: entry.get() for key, entry in self.entries.items()}
+        return _format_conn_str(
+            values["driver"], values["server"], values["database"], values["user"], values["password"]
+        )
     
     def test_connection(self):
         """Validate the connection details entered by the user."""
@@ -397,40 +469,76 @@ class App(tk.Tk):
             messagebox.showerror("Error", "Please provide connection details")
             return
         try:
-            pyodbc.connect(conn_str, timeout=5)
+            self._connect(conn_str)
         except Exception as exc:
             messagebox.showerror("Connection Failed", str(exc))
             return
 
         messagebox.showinfo("Success", "Connection successful!")
         self.conn_str = conn_str
-        os.environ["MSSQL_TARGET_CONN_STR"] = conn_str
-        db_name = self.entries["database"].get()
-        if db_name:
-            os.environ["MSSQL_TARGET_DB_NAME"] = db_name
         self.csv_dir = self.csv_dir_var.get()
-        if self.csv_dir:
-            os.environ["EJ_CSV_DIR"] = self.csv_dir
+        # Export the connection details for the ETL scripts; optional values
+        # are only set when provided
+        env_updates = (
+            ("MSSQL_TARGET_CONN_STR", conn_str),
+            ("MSSQL_TARGET_DB_NAME", self.entries["database"].get()),
+            ("EJ_CSV_DIR", self.csv_dir),
+        )
+        os.environ.update({key: value for key, value in env_updates if value})
+        self._child_env = None
         
         # Save current configuration
         self._save_config()
         
         self._show_script_widgets()
     
+    def _connect(self, conn_str):
+        """Return an open connection for ``conn_str``.
+
+        The connection from the last successful test is kept open and, when the
+        connection string is unchanged, checked with ``SELECT 1`` instead of
+        repeating the login handshake.
+        """
+        if self._conn is not None:
+            if conn_str == self.conn_str:
+                try:
+                    self._conn.cursor().execute("SELECT 1")
+                    return self._conn
+                except Exception:
+                    logger.info("Cached connection is no longer usable, reconnecting")
+            self._close_connection()
+        self._conn = pyodbc.connect(conn_str, timeout=5, autocommit=True)
+        return self._conn
+
+    def _close_connection(self):
+        """Close the cached test connection if one is open."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception as e:
+                logger.error(f"Error closing connection: {e}")
+            self._conn = None
+
     def clear_output(self):
         """Clear the output text area."""
         self.output_text.delete(1.0, tk.END)
         self.output_text.insert(tk.END, f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Output cleared.\n\n")
     
     def run_script(self, path):
-        """Launch the selected ETL script in a background thread."""
+        """Launch the selected ETL script on the background event loop.
+
+        Other scripts keep running; only this script's button is disabled
+        until it finishes.  At most ``MAX_CONCURRENT_SCRIPTS`` children run
+        at once and later launches are queued.
+        """
         if not self.conn_str:
             messagebox.showerror("Error", "Please test the connection first")
             return
+        if path in self.running_scripts:
+            return
         
-        # Disable all run buttons while a script is running
-        for btn in self.run_buttons.values():
-            btn.config(state=tk.DISABLED)
+        # Disable this script's run button while it is running
+        self.run_buttons[path].config(state=tk.DISABLED)
         
         # Reset status
         self.status_labels[path].set("Starting...")
@@ -438,52 +546,45 @@ class App(tk.Tk):
         if self.auto_scroll_var.get():
             self.output_text.see(tk.END)
         
-        # Set up environment
-        os.environ["INCLUDE_EMPTY_TABLES"] = "1" if self.include_empty_var.get() else "0"
-        
-        my_env = os.environ.copy()
-        my_env["PYTHONUNBUFFERED"] = "1"
-        my_env["PYTHONIOENCODING"] = "utf-8"
-        
-        # Stop any existing runner
-        if self.current_runner and self.current_runner.is_alive():
-            self.current_runner.stop()
-            self.current_runner.join(timeout=5)
-        
-        # Create and start new runner thread
-        self.current_runner = ScriptRunner(path, my_env, self.update_queue, self.status_queue)
-        self.current_runner.start()
-        
-        # Store which script is currently running
-        self.current_script = path
+        # Schedule the script on the event loop pumped by Tk
+        self.running_scripts[path] = self._get_event_loop().create_task(
+            run_script_async(
+                path, self._child_environment(), self.update_queue, self.status_queue,
+                slots=self._script_slots,
+            )
+        )
     
     def _process_queues(self):
-        """Process updates from the runner threads."""
+        """Process output and status updates from the running scripts."""
         try:
-            # Process output queue
+            # Process output queue, collecting the text so the widget is
+            # updated with a single insert per tick
+            pending_output = []
             while True:
                 try:
                     msg_type, content = self.update_queue.get_nowait()
                     
                     if msg_type == "output":
-                        self.output_text.insert(tk.END, content)
-                        if self.auto_scroll_var.get():
-                            self.output_text.see(tk.END)
+                        pending_output.append(content)
                     elif msg_type == "done":
-                        # Re-enable all buttons
-                        for btn in self.run_buttons.values():
-                            btn.config(state=tk.NORMAL)
-                        break
+                        # Re-enable the finished script's button
+                        self.running_scripts.pop(content, None)
+                        self.run_buttons[content].config(state=tk.NORMAL)
                         
                 except queue.Empty:
                     break
+
+            if pending_output:
+                self.output_text.insert(tk.END, "".join(pending_output))
+                self._trim_output()
+                if self.auto_scroll_var.get():
+                    self.output_text.see(tk.END)
             
             # Process status queue
             while True:
                 try:
-                    msg_type, status = self.status_queue.get_nowait()
-                    if msg_type == "status" and hasattr(self, 'current_script'):
-                        self.status_labels[self.current_script].set(status)
+                    path, status = self.status_queue.get_nowait()
+                    self.status_labels[path].set(status)
                 except queue.Empty:
                     break
                     
@@ -493,12 +594,50 @@ class App(tk.Tk):
         # Schedule next check
         self.after(50, self._process_queues)  # Check every 50ms for responsive UI
     
+    def _trim_output(self):
+        """Delete the oldest lines so the output pane holds at most ``MAX_OUTPUT_LINES``."""
+        line_count = int(self.output_text.index("end-1c").split(".")[0])
+        if line_count > self.MAX_OUTPUT_LINES:
+            self.output_text.delete("1.0", f"{line_count - self.MAX_OUTPUT_LINES + 1}.0")
+
+    def _get_event_loop(self):
+        """Return the event loop running the scripts, creating it on first use.
+
+        The loop runs on the Tk thread: ``_pump_event_loop`` gives it one
+        pass every ``EVENT_LOOP_INTERVAL_MS`` so subprocess I/O and the UI
+        share a single thread.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._script_slots = asyncio.Semaphore(MAX_CONCURRENT_SCRIPTS)
+            self._loop_pump_id = self.after(self.EVENT_LOOP_INTERVAL_MS, self._pump_event_loop)
+        return self._loop
+
+    def _pump_event_loop(self):
+        """Run one pass of the script event loop and reschedule."""
+        self._loop.call_soon(self._loop.stop)
+        self._loop.run_forever()
+        self._loop_pump_id = self.after(self.EVENT_LOOP_INTERVAL_MS, self._pump_event_loop)
+
+    def _stop_running_scripts(self, timeout):
+        """Cancel all running scripts and wait up to ``timeout`` seconds for them to exit."""
+        if all(run.done() for run in self.running_scripts.values()):
+            return
+        try:
+            self._loop.run_until_complete(
+                asyncio.wait_for(_cancel_running_scripts(list(self.running_scripts.values())), timeout)
+            )
+        except Exception as e:
+            logger.error(f"Error stopping running script: {e}")
+
     def destroy(self):
         """Clean up when closing the application."""
-        # Stop any running threads
-        if self.current_runner and self.current_runner.is_alive():
-            self.current_runner.stop()
-            self.current_runner.join(timeout=2)
+        # Stop any running scripts and close the loop that drives them
+        self._stop_running_scripts(timeout=2)
+        if self._loop is not None:
+            self.after_cancel(self._loop_pump_id)
+            self._loop.close()
+        self._close_connection()
         super().destroy()
 
 if __name__ == "__main__":
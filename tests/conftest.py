@@ -0,0 +1,197 @@
+"""Shared test configuration.
+
+Heavy optional dependencies are replaced with small stubs when they are not
+installed so the modules under test can be imported.  pytest loads this file
+once before collecting the test modules.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+if "tqdm" not in sys.modules:
+    dummy = types.ModuleType("tqdm")
+    def _tqdm(iterable, **kwargs):
+        for item in iterable:
+            yield item
+    dummy.tqdm = _tqdm
+    sys.modules["tqdm"] = dummy
+
+if "pandas" not in sys.modules:
+    sys.modules["pandas"] = types.ModuleType("pandas")
+
+if "sqlalchemy" not in sys.modules:
+    sa_mod = types.ModuleType("sqlalchemy")
+    types_mod = types.SimpleNamespace(Text=lambda *a, **k: None)
+    sa_mod.types = types_mod
+    sys.modules["sqlalchemy"] = sa_mod
+    sys.modules["sqlalchemy.types"] = types_mod
+
+if "pyodbc" not in sys.modules:
+    class _DummyError(Exception):
+        pass
+    sys.modules["pyodbc"] = types.SimpleNamespace(
+        Error=_DummyError, connect=lambda *a, **k: None
+    )
+
+if "mysql" not in sys.modules:
+    dummy_mysql = types.ModuleType("mysql")
+    dummy_mysql.connector = types.SimpleNamespace(connect=lambda **k: None)
+    sys.modules["mysql"] = dummy_mysql
+    sys.modules["mysql.connector"] = dummy_mysql.connector
+
+if "dotenv" not in sys.modules:
+    mod = types.ModuleType("dotenv")
+    mod.load_dotenv = lambda *a, **k: None
+    sys.modules["dotenv"] = mod
+
+# tkinter ships with most Python builds, so only stub it when it is missing.
+try:
+    import tkinter  # noqa: F401
+except ImportError:
+    tk = types.ModuleType("tkinter")
+    tk.Tk = object
+    tk.Label = object
+    tk.Entry = object
+    tk.Button = object
+    tk.Checkbutton = object
+    tk.Frame = object
+    tk.BooleanVar = object
+    tk.StringVar = object
+    tk.scrolledtext = types.SimpleNamespace(ScrolledText=object)
+    tk.messagebox = types.SimpleNamespace(
+        askyesno=lambda *a, **k: False,
+        showerror=lambda *a, **k: None,
+        showinfo=lambda *a, **k: None,
+    )
+    tk.filedialog = types.SimpleNamespace(askdirectory=lambda *a, **k: "")
+    sys.modules["tkinter"] = tk
+    sys.modules["tkinter.messagebox"] = tk.messagebox
+    sys.modules["tkinter.scrolledtext"] = tk.scrolledtext
+    sys.modules["tkinter.filedialog"] = tk.filedialog
+
+
+class DummyCursor:
+    """Cursor double that fails on demand using its connection's settings."""
+
+    __slots__ = (
+        "fail", "fail_sql", "conn", "description", "arraysize", "rows", "fast_executemany",
+        "closed",
+    )
+
+    def __init__(self, fail=False, fail_sql=None, conn=None):
+        self.fail = fail
+        self.fail_sql = fail_sql
+        self.conn = conn
+        self.description = None
+        self.arraysize = 1
+        self.rows = []
+        self.fast_executemany = False
+        self.closed = False
+    def execute(self, sql, params=None):
+        if self.conn:
+            self.conn.executed.append(sql)
+        self.description = None
+        self.rows = []
+        if 'SET LOCK_TIMEOUT' in sql:
+            return
+        if (
+            self.fail
+            or (self.fail_sql and sql.strip() == self.fail_sql)
+            or (self.conn and self.conn.fail_times > 0)
+        ):
+            if self.conn and self.conn.fail_times > 0:
+                # Transient failures look like a query timeout
+                self.conn.fail_times -= 1
+                raise sys.modules["pyodbc"].Error("HYT00", "boom")
+            raise sys.modules["pyodbc"].Error("42000", "boom")
+        if sql.lstrip().upper().startswith("SELECT"):
+            self.description = (("col", str, None, None, None, None, True),)
+            self.rows = [('row',)]
+    def executemany(self, sql, seq_of_params):
+        for params in seq_of_params:
+            self.execute(sql, params)
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+    def nextset(self):
+        return False
+    def close(self):
+        self.closed = True
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+class DummyConn:
+    """Connection double recording executed SQL, commits and rollbacks."""
+
+    __slots__ = (
+        "fail", "fail_sql", "fail_times", "autocommit", "commits", "rollbacks", "executed",
+    )
+
+    def __init__(self, fail=False, fail_sql=None, fail_times=0):
+        self.fail = fail
+        self.fail_sql = fail_sql
+        self.fail_times = fail_times
+        self.autocommit = True
+        self.commits = 0
+        self.rollbacks = 0
+        self.executed = []
+
+    def cursor(self):
+        return DummyCursor(self.fail, self.fail_sql, conn=self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def make_conn():
+    """Return a factory for ``DummyConn`` objects, e.g. ``make_conn(fail=True)``."""
+    return DummyConn
+
+
+RUN_ETL_PATH = Path(__file__).resolve().parents[1] / "run_etl.py"
+
+
+def _exec_run_etl(spec, cwd):
+    """Execute run_etl.py from ``spec`` as if started in ``cwd``."""
+    module = importlib.util.module_from_spec(spec)
+    old_cwd = os.getcwd()
+    os.chdir(cwd)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(old_cwd)
+    return module
+
+
+@pytest.fixture(scope="session")
+def run_etl_spec():
+    """Module spec for run_etl.py, which is a script rather than a package module."""
+    return importlib.util.spec_from_file_location("run_etl", RUN_ETL_PATH)
+
+
+@pytest.fixture(scope="session")
+def run_etl(run_etl_spec, tmp_path_factory):
+    """run_etl imported once per session from outside the repository."""
+    return _exec_run_etl(run_etl_spec, tmp_path_factory.mktemp("cwd"))
+
+
+@pytest.fixture
+def load_run_etl(run_etl_spec, tmp_path):
+    """Return a function importing a fresh run_etl, for tests that replace its imports."""
+    return lambda: _exec_run_etl(run_etl_spec, tmp_path)
@@ -1,44 +1,8 @@
 import os
 import pytest
-import sys, types
+import types
 import argparse
 
-if "tqdm" not in sys.modules:
-    dummy = types.ModuleType("tqdm")
-    def _tqdm(iterable, **kwargs):
-        for item in iterable:
-            yield item
-    dummy.tqdm = _tqdm
-    sys.modules["tqdm"] = dummy
-
-if "pandas" not in sys.modules:
-    sys.modules["pandas"] = types.ModuleType("pandas")
-
-if "sqlalchemy" not in sys.modules:
-    sa_mod = types.ModuleType("sqlalchemy")
-    types_mod = types.SimpleNamespace(Text=lambda *a, **k: None)
-    sa_mod.types = types_mod
-    sys.modules["sqlalchemy"] = sa_mod
-    sys.modules["sqlalchemy.types"] = types_mod
-
-if "pyodbc" not in sys.modules:
-    class _DummyError(Exception):
-        pass
-    sys.modules["pyodbc"] = types.SimpleNamespace(
-        Error=_DummyError, connect=lambda *a, **k: None
-    )
-
-if "mysql" not in sys.modules:
-    dummy_mysql = types.ModuleType("mysql")
-    dummy_mysql.connector = types.SimpleNamespace(connect=lambda **k: None)
-    sys.modules["mysql"] = dummy_mysql
-    sys.modules["mysql.connector"] = dummy_mysql.connector
-
-if "dotenv" not in sys.modules:
-    mod = types.ModuleType("dotenv")
-    mod.load_dotenv = lambda *a, **k: None
-    sys.modules["dotenv"] = mod
-
 from etl.base_importer import BaseDBImporter
 
 
@@ -85,13 +49,21 @@ def test_load_config_env_and_args(monkeypatch, tmp_path):
 def test_show_completion_message(monkeypatch):
     importer = BaseDBImporter()
 
-    dummy_tk = types.SimpleNamespace(withdraw=lambda: None, destroy=lambda: None)
-    monkeypatch.setattr('etl.base_importer.tk.Tk', lambda: dummy_tk)
+    created = []
+    def fake_tk():
+        root = types.SimpleNamespace(withdraw=lambda: None, destroy=lambda: None)
+        created.append(root)
+        return root
+    monkeypatch.setattr('etl.base_importer._hidden_root', None)
+    monkeypatch.setattr('etl.base_importer.tk.Tk', fake_tk)
     monkeypatch.setattr('etl.base_importer.messagebox.askyesno', lambda *a, **k: True)
 
     assert importer.show_completion_message('Next') is True
 
     info_called = {}
-    monkeypatch.setattr('etl.base_importer.messagebox.showinfo', lambda *a, **k: info_called.setdefault('called', True))
+    monkeypatch.setattr('etl.base_importer.messagebox.showinfo', lambda *a, **k: info_called.setdefault('parent', k.get('parent')))
     assert importer.show_completion_message(None) is False
-    assert info_called.get('called')
+    assert info_called.get('parent') is created[0]
+
+    # The hidden root is created once and reused for every dialog
+    assert len(created) == 1
@@ -1,21 +1,7 @@
 import os
 import pytest
-import sys, types
 
-if "tqdm" not in sys.modules:
-    dummy = types.ModuleType("tqdm")
-    def _tqdm(iterable, **kwargs):
-        for item in iterable:
-            yield item
-    dummy.tqdm = _tqdm
-    sys.modules["tqdm"] = dummy
-
-if "dotenv" not in sys.modules:
-    mod = types.ModuleType("dotenv")
-    mod.load_dotenv = lambda *a, **k: None
-    sys.modules["dotenv"] = mod
-
-from etl.core import sanitize_sql
+from etl.core import load_config, sanitize_sql
 
 
 def test_sanitize_sql_allows_normal_statements():
@@ -27,3 +13,15 @@ def test_sanitize_sql_rejects_injection_attempt():
     malicious = "'; DROP TABLE users; --"
     result = sanitize_sql(malicious)
     assert result == ""
+
+
+def test_load_config_missing_file_uses_defaults(tmp_path):
+    config = load_config(str(tmp_path / "missing.json"), {"sql_timeout": 300})
+    assert config == {"sql_timeout": 300}
+
+
+def test_load_config_merges_file_values(tmp_path):
+    config_file = tmp_path / "values.json"
+    config_file.write_text('{"sql_timeout": 600}', encoding="utf-8")
+    config = load_config(str(config_file), {"sql_timeout": 300, "skip_pk_creation": False})
+    assert config == {"sql_timeout": 600, "skip_pk_creation": False}
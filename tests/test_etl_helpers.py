@@ -1,105 +1,346 @@
-import pytest
-import sys, types
-
-if "pyodbc" not in sys.modules:
-    class _DummyError(Exception):
-        pass
-    sys.modules["pyodbc"] = types.SimpleNamespace(
-        Error=_DummyError, connect=lambda *a, **k: None
-    )
+import os
 
-if "dotenv" not in sys.modules:
-    mod = types.ModuleType("dotenv")
-    mod.load_dotenv = lambda *a, **k: None
-    sys.modules["dotenv"] = mod
+import pytest
 
 from config import ETLConstants
 from utils.etl_helpers import (
+    configure_connection,
+    execute_many_with_timeout,
+    iter_rows,
     run_sql_step,
     run_sql_script,
     run_sql_step_with_retry,
     load_sql,
+    log_exception_to_file,
+    flush_error_log,
     SQLExecutionError,
     transaction_scope,
 )
 
-class DummyCursor:
-    def __init__(self, fail=False, fail_sql=None, conn=None):
-        self.fail = fail
-        self.fail_sql = fail_sql
-        self.conn = conn
-    def execute(self, sql, params=None):
-        if 'SET LOCK_TIMEOUT' in sql:
-            return
-        if (
-            self.fail
-            or (self.fail_sql and sql.strip() == self.fail_sql)
-            or (self.conn and self.conn.fail_times > 0)
-        ):
-            if self.conn and self.conn.fail_times > 0:
-                self.conn.fail_times -= 1
-            raise sys.modules["pyodbc"].Error("boom")
-    def fetchall(self):
-        return [('row',)]
-    def __enter__(self):
-        return self
-    def __exit__(self, exc_type, exc, tb):
-        pass
-
-class DummyConn:
-    def __init__(self, fail=False, fail_sql=None, fail_times=0):
-        self.fail = fail
-        self.fail_sql = fail_sql
-        self.fail_times = fail_times
-        self.autocommit = True
-        self.commits = 0
-        self.rollbacks = 0
-
-    def cursor(self):
-        return DummyCursor(self.fail, self.fail_sql, conn=self)
-
-    def commit(self):
-        self.commits += 1
-
-    def rollback(self):
-        self.rollbacks += 1
-
-
-def test_run_sql_step_success():
-    conn = DummyConn()
+def test_run_sql_step_success(make_conn):
+    conn = make_conn()
     result = run_sql_step(conn, 'test', 'SELECT 1')
     assert result == [('row',)]
 
 
-def test_run_sql_step_failure():
-    conn = DummyConn(fail=True)
+def test_iter_rows_fetches_arraysize_rows_per_call():
+    class Cursor:
+        arraysize = 2
+
+        def __init__(self):
+            self.rows = [(i,) for i in range(5)]
+            self.sizes = []
+
+        def fetchmany(self, size):
+            self.sizes.append(size)
+            rows, self.rows = self.rows[:size], self.rows[size:]
+            return rows
+
+    cursor = Cursor()
+    assert list(iter_rows(cursor)) == [(i,) for i in range(5)]
+    assert cursor.sizes == [2, 2, 2, 2]
+
+
+def test_run_sql_step_can_discard_rows(make_conn):
+    conn = make_conn()
+    assert run_sql_step(conn, 'count', 'SELECT 1', keep_results=False) is None
+
+
+def test_run_sql_step_without_result_set(make_conn):
+    conn = make_conn()
+    assert run_sql_step(conn, 'ddl', 'DROP TABLE IF EXISTS t') is None
+
+
+def test_run_sql_step_failure(make_conn):
+    conn = make_conn(fail=True)
     with pytest.raises(SQLExecutionError) as exc:
         run_sql_step(conn, 'table', 'SELECT 1')
     assert exc.value.sql == 'SELECT 1'
     assert exc.value.table_name == 'table'
 
 
-def test_run_sql_script_failure():
+def test_sql_execution_error_message():
+    import pickle
+
+    exc = SQLExecutionError('SELECT 1', RuntimeError('boom'), table_name='table')
+    assert str(exc) == 'SQL execution failed for table: boom'
+    assert str(SQLExecutionError('SELECT 1', RuntimeError('boom'))) == (
+        'SQL execution failed for statement: boom'
+    )
+    assert exc.args == ('SELECT 1', exc.original_error, 'table')
+    copy = pickle.loads(pickle.dumps(exc))
+    assert (copy.sql, copy.table_name, str(copy)) == ('SELECT 1', 'table', str(exc))
+
+
+def test_run_sql_script_failure(make_conn):
     sql = 'SELECT 1; FAIL; SELECT 2'
-    conn = DummyConn(fail_sql='FAIL')
+    conn = make_conn(fail_sql='FAIL')
     with pytest.raises(SQLExecutionError) as exc:
         run_sql_script(conn, 'table', sql)
     assert exc.value.sql.strip() == 'FAIL'
     assert exc.value.table_name == 'table'
 
 
-def test_run_sql_step_with_retry_success():
-    conn = DummyConn()
+def test_run_sql_script_commits_once_at_end(make_conn):
+    sql = 'SELECT 1; SELECT 2\nGO\nSELECT 3; SELECT 4'
+    conn = make_conn()
+    run_sql_script(conn, 'table', sql)
+    assert conn.commits == 1
+    assert conn.rollbacks == 0
+
+
+def test_run_sql_script_commit_every_batches(make_conn):
+    sql = 'SELECT 1\nGO\nSELECT 2\nGO\nSELECT 3'
+    conn = make_conn()
+    run_sql_script(conn, 'table', sql, commit_every=2)
+    assert conn.commits == 2
+
+    conn = make_conn()
+    run_sql_script(conn, 'table', sql, commit_every=1)
+    assert conn.commits == 3
+
+
+def test_run_sql_script_groups_statements_per_round_trip(make_conn):
+    conn = make_conn()
+    run_sql_script(conn, 'table', 'SELECT 1; SELECT 2; SELECT 3\nGO\nSELECT 4', batch_size=2)
+    assert conn.executed[-3:] == ['SELECT 1;\nSELECT 2', 'SELECT 3', 'SELECT 4']
+    assert conn.commits == 1
+
+
+def test_run_sql_script_disables_autocommit_while_running(make_conn):
+    class RecordingConn(make_conn):
+        __slots__ = ("autocommit_seen",)
+
+        def commit(self):
+            self.autocommit_seen = self.autocommit
+            super().commit()
+
+    conn = RecordingConn()
+    run_sql_script(conn, 'table', 'SELECT 1; SELECT 2')
+    assert conn.autocommit_seen is False
+    assert conn.autocommit is True
+    assert conn.commits == 1
+
+
+def test_run_sql_script_failure_rolls_back_batch(make_conn):
+    conn = make_conn(fail_sql='FAIL')
+    with pytest.raises(SQLExecutionError):
+        run_sql_script(conn, 'table', 'SELECT 1; FAIL; SELECT 2')
+    assert conn.commits == 0
+    assert conn.rollbacks == 1
+
+
+def test_execute_many_sends_parameter_sets_in_chunks(make_conn, monkeypatch):
+    conn = make_conn()
+    cursor = conn.cursor()
+    chunks = []
+    monkeypatch.setattr(type(cursor), 'executemany', lambda self, sql, params: chunks.append(params))
+    monkeypatch.setattr(type(conn), 'cursor', lambda self: cursor)
+
+    rows = ((i, 'x') for i in range(5))
+    assert execute_many_with_timeout(conn, 'INSERT INTO t VALUES (?, ?)', rows, batch_size=2) == 5
+    assert cursor.fast_executemany is True
+    assert chunks == [[(0, 'x'), (1, 'x')], [(2, 'x'), (3, 'x')], [(4, 'x')]]
+
+
+def test_execute_many_failure_raises_sql_error(make_conn):
+    conn = make_conn(fail_sql='INSERT INTO t VALUES (?)')
+    with pytest.raises(SQLExecutionError) as exc:
+        execute_many_with_timeout(conn, 'INSERT INTO t VALUES (?)', [(1,)])
+    assert exc.value.sql == 'INSERT INTO t VALUES (?)'
+
+
+def test_run_sql_script_rolls_back_when_periodic_commit_fails(make_conn):
+    class SecondCommitFails(make_conn):
+        def commit(self):
+            if self.commits == 1:
+                raise RuntimeError("commit failed")
+            super().commit()
+
+    conn = SecondCommitFails()
+    sql = 'SELECT 1\nGO\nSELECT 2\nGO\nSELECT 3'
+    with pytest.raises(SQLExecutionError):
+        run_sql_script(conn, 'table', sql, commit_every=1)
+    assert conn.commits == 1
+    assert conn.rollbacks == 1
+    assert conn.executed[-1] == 'SELECT 2'
+
+
+def test_run_sql_script_rolls_back_before_restoring_autocommit(make_conn):
+    class FailingCommitConn(make_conn):
+        __slots__ = ("autocommit_at_rollback",)
+
+        def commit(self):
+            raise RuntimeError("commit failed")
+
+        def rollback(self):
+            self.autocommit_at_rollback = self.autocommit
+            super().rollback()
+
+    conn = FailingCommitConn()
+    with pytest.raises(SQLExecutionError):
+        run_sql_script(conn, 'table', 'SELECT 1; SELECT 2')
+    assert conn.rollbacks == 1
+    assert conn.autocommit_at_rollback is False
+    assert conn.autocommit is True
+
+
+def test_split_script_groups_statements_by_batch():
+    from utils.etl_helpers import _split_script
+
+    sql = 'SELECT 1;\n-- note\n;\n SELECT 2 ;\nGO\n;\nGO\nSELECT 3'
+    assert _split_script(sql) == (('SELECT 1', 'SELECT 2'), ('SELECT 3',))
+
+
+def test_run_sql_script_parses_repeated_script_once(make_conn, monkeypatch):
+    import utils.etl_helpers as helpers
+
+    calls = []
+    original = helpers._iter_statements
+
+    def counting(sql):
+        calls.append(sql)
+        return original(sql)
+
+    monkeypatch.setattr(helpers, '_iter_statements', counting)
+    sql = 'SELECT 1; SELECT 2\nGO\nSELECT 3 -- parsed once'
+    for _ in range(3):
+        run_sql_script(make_conn(), 'table', sql)
+    assert calls == [sql]
+
+
+def test_split_script_ignores_semicolons_in_literals_and_comments():
+    from utils.etl_helpers import _split_script
+
+    sql = (
+        "SELECT 'a;b', [x;y] FROM t -- trailing; comment\n"
+        "WHERE c = 'it''s;';"
+        "/* block; /* nested; */ still comment; */ SELECT 2;"
+        "/* only a comment; */"
+    )
+    assert _split_script(sql) == ((
+        "SELECT 'a;b', [x;y] FROM t -- trailing; comment\nWHERE c = 'it''s;'",
+        "/* block; /* nested; */ still comment; */ SELECT 2",
+    ),)
+
+
+def test_run_sql_helpers_close_their_cursor(make_conn):
+    class TrackingConn(make_conn):
+        __slots__ = ("cursors",)
+
+        def cursor(self):
+            cursor = super().cursor()
+            self.cursors = getattr(self, "cursors", []) + [cursor]
+            return cursor
+
+    conn = TrackingConn(fail_sql='FAIL')
+    run_sql_step(conn, 'a', 'SELECT 1')
+    run_sql_script(conn, 'b', 'SELECT 2; SELECT 3')
+    with pytest.raises(SQLExecutionError):
+        run_sql_step(conn, 'c', 'FAIL')
+    execute_many_with_timeout(conn, 'INSERT INTO t VALUES (?)', [(1,), (2,)])
+
+    # One cursor per call, closed before returning so nothing keeps the
+    # connection alive after the caller drops it
+    assert len(conn.cursors) == 4
+    assert all(cursor.closed for cursor in conn.cursors)
+
+
+def test_run_sql_step_commits_without_autocommit(make_conn):
+    conn = make_conn()
+    conn.autocommit = False
+    run_sql_step(conn, 'a', 'UPDATE t SET c = 1')
+    assert conn.commits == 1
+
+
+def test_lock_timeout_set_once_per_connection(make_conn):
+    import weakref
+
+    conn = make_conn()
+    # Like pyodbc.Connection, the double cannot be weakly referenced
+    with pytest.raises(TypeError):
+        weakref.ref(conn)
+
+    run_sql_step(conn, 'a', 'SELECT 1')
+    run_sql_script(conn, 'b', 'SELECT 2; SELECT 3')
+    run_sql_step(conn, 'c', 'SELECT 4', timeout=5)
+    run_sql_step(conn, 'e', 'SELECT 6', timeout=5)
+    assert [sql for sql in conn.executed if 'LOCK_TIMEOUT' in sql] == [
+        f'SET LOCK_TIMEOUT {ETLConstants.DEFAULT_SQL_TIMEOUT * 1000}',
+        'SET LOCK_TIMEOUT 5000',
+    ]
+
+    other = make_conn()
+    run_sql_step(other, 'd', 'SELECT 5', timeout=5)
+    assert other.executed == ['SET LOCK_TIMEOUT 5000', 'SELECT 5']
+
+
+def test_configure_connection_sets_lock_timeout_once(make_conn):
+    conn = make_conn()
+    configure_connection(conn, 5)
+    run_sql_step(conn, 'a', 'SELECT 1', timeout=5)
+    run_sql_script(conn, 'b', 'SELECT 2; SELECT 3', timeout=5)
+    assert conn.executed == ['SET LOCK_TIMEOUT 5000', 'SELECT 1', 'SELECT 2', 'SELECT 3']
+
+
+def test_lock_timeout_cache_is_per_thread(make_conn):
+    import threading
+
+    conn = make_conn()
+    run_sql_step(conn, 'a', 'SELECT 1', timeout=7)
+    worker = threading.Thread(target=run_sql_step, args=(conn, 'b', 'SELECT 2'), kwargs={'timeout': 7})
+    worker.start()
+    worker.join()
+    assert conn.executed.count('SET LOCK_TIMEOUT 7000') == 2
+
+
+def test_lock_timeout_leaves_connection_query_timeout_alone(make_conn):
+    class TimeoutConn(make_conn):
+        __slots__ = ('timeout',)
+
+    conn = TimeoutConn()
+    conn.timeout = 0
+    run_sql_step(conn, 'a', 'SELECT 1', timeout=9)
+    assert conn.timeout == 0
+    assert conn.executed == ['SET LOCK_TIMEOUT 9000', 'SELECT 1']
+
+
+def test_split_script_recognizes_go_lines_outside_literals():
+    from utils.etl_helpers import _split_script
+
+    sql = "SELECT 1\ngo\nSELECT 'a\nGO\nb'\n  GO  \n/*\nGO\n*/ SELECT 3\nGO"
+    assert _split_script(sql) == (
+        ('SELECT 1',),
+        ("SELECT 'a\nGO\nb'",),
+        ('/*\nGO\n*/ SELECT 3',),
+    )
+
+
+def test_run_sql_step_with_retry_success(make_conn):
+    conn = make_conn()
     result = run_sql_step_with_retry(conn, 'test', 'SELECT 1')
     assert result == [('row',)]
 
 
-def test_run_sql_step_with_retry_retries(monkeypatch):
-    conn = DummyConn(fail_times=2)
+def test_run_sql_step_with_retry_retries(monkeypatch, make_conn):
+    delays = []
+    monkeypatch.setattr('utils.etl_helpers.time.sleep', delays.append)
+    conn = make_conn(fail_times=2)
     result = run_sql_step_with_retry(
         conn, 'test', 'SELECT 1', max_retries=ETLConstants.MAX_RETRY_ATTEMPTS
     )
     assert result == [('row',)]
+    assert len(delays) == 2
+    assert 1 <= delays[0] <= 1.5 and 2 <= delays[1] <= 2.5
+
+
+def test_run_sql_step_with_retry_does_not_retry_permanent_errors(monkeypatch, make_conn):
+    delays = []
+    monkeypatch.setattr('utils.etl_helpers.time.sleep', delays.append)
+    conn = make_conn(fail=True)
+    with pytest.raises(SQLExecutionError):
+        run_sql_step_with_retry(conn, 'test', 'SELECT 1')
+    assert delays == []
 
 
 def test_load_sql_valid_path():
@@ -107,13 +348,67 @@ def test_load_sql_valid_path():
     assert 'CREATE TABLE' in sql
 
 
+def test_load_sql_rereads_changed_file(monkeypatch, tmp_path):
+    import utils.etl_helpers as helpers
+
+    monkeypatch.setattr(helpers, 'SQL_SCRIPTS_DIR', str(tmp_path))
+    script = tmp_path / 'step.sql'
+    script.write_text('SELECT 1 FROM ELPaso_TX.dbo.t')
+    assert load_sql('step.sql', 'Target') == 'SELECT 1 FROM Target.dbo.t'
+
+    script.write_text('SELECT 2')
+    os.utime(script, (0, 0))
+    assert load_sql('step.sql') == 'SELECT 2'
+
+
+def test_load_sql_normalizes_line_endings(monkeypatch, tmp_path):
+    import utils.etl_helpers as helpers
+
+    monkeypatch.setattr(helpers, 'SQL_SCRIPTS_DIR', str(tmp_path))
+    (tmp_path / 'crlf.sql').write_bytes(b'SELECT 1\r\nGO\r\nSELECT 2\r')
+    assert load_sql('crlf.sql') == 'SELECT 1\nGO\nSELECT 2\n'
+
+
+def test_load_sql_replaces_both_db_name_spellings(monkeypatch, tmp_path):
+    import utils.etl_helpers as helpers
+
+    monkeypatch.setattr(helpers, 'SQL_SCRIPTS_DIR', str(tmp_path))
+    (tmp_path / 'names.sql').write_text(
+        'SELECT * FROM ELPaso_TX.dbo.a JOIN ElPaso_TX.dbo.b ON 1 = 1 -- ELPASO_TX'
+    )
+    assert load_sql('names.sql', 'Target') == (
+        'SELECT * FROM Target.dbo.a JOIN Target.dbo.b ON 1 = 1 -- ELPASO_TX'
+    )
+
+
+def test_load_sql_reuses_substituted_text():
+    sql = load_sql('misc/gather_lobs.sql', 'Target')
+    assert 'Paso_TX' not in sql and 'Target' in sql
+    assert load_sql('misc/gather_lobs.sql', 'Target') is sql
+
+
+def test_load_sql_keeps_text_for_source_db_name():
+    sql = load_sql('misc/gather_lobs.sql')
+    assert load_sql('misc/gather_lobs.sql', 'ELPaso_TX') is sql
+    assert load_sql('misc/gather_lobs.sql', 'ElPaso_TX') is sql
+
+
+def test_sql_script_index_lists_bundled_scripts():
+    import utils.etl_helpers as helpers
+
+    index = helpers._sql_script_index(helpers.SQL_SCRIPTS_DIR)
+    assert index['lob/gather_lobs.sql'] == os.path.join(
+        helpers.SQL_SCRIPTS_DIR, 'lob', 'gather_lobs.sql'
+    )
+
+
 def test_load_sql_path_traversal():
     with pytest.raises(ValueError):
         load_sql('../utils/etl_helpers.py')
 
 
-def test_transaction_scope_commit_and_restore():
-    conn = DummyConn()
+def test_transaction_scope_commit_and_restore(make_conn):
+    conn = make_conn()
     assert conn.autocommit is True
     with transaction_scope(conn):
         assert conn.autocommit is False
@@ -122,8 +417,8 @@ def test_transaction_scope_commit_and_restore():
     assert conn.rollbacks == 0
 
 
-def test_transaction_scope_rollback_on_error():
-    conn = DummyConn()
+def test_transaction_scope_rollback_on_error(make_conn):
+    conn = make_conn()
     with pytest.raises(RuntimeError):
         with transaction_scope(conn):
             assert conn.autocommit is False
@@ -131,3 +426,31 @@ def test_transaction_scope_rollback_on_error():
     assert conn.autocommit is True
     assert conn.commits == 0
     assert conn.rollbacks == 1
+
+
+def test_log_exception_to_file_writes_in_background(tmp_path):
+    log_path = tmp_path / 'errors.log'
+    log_exception_to_file('first', str(log_path))
+    log_exception_to_file('second', str(log_path))
+    flush_error_log()
+    lines = log_path.read_text(encoding='utf-8').splitlines()
+    assert [line.split('] ', 1)[1] for line in lines] == ['first', 'second']
+
+
+def test_error_log_timestamp_formatted_once_per_second(monkeypatch):
+    import time
+    import utils.etl_helpers as helpers
+
+    calls = []
+    real_strftime = time.strftime
+
+    def counting_strftime(fmt, t):
+        calls.append(t)
+        return real_strftime(fmt, t)
+
+    monkeypatch.setattr(helpers.time, 'strftime', counting_strftime)
+    monkeypatch.setattr(helpers, '_last_log_second', -1)
+    first = helpers._format_log_time(1_700_000_000.1)
+    assert helpers._format_log_time(1_700_000_000.9) is first
+    assert helpers._format_log_time(1_700_000_001.0) != first
+    assert len(calls) == 2
@@ -2,35 +2,6 @@
 
 import sqlite3
 import argparse
-import sys
-import types
-
-# Stub heavy optional dependencies if they are missing.  This mirrors the
-# approach used in the unit tests for the other modules.
-if "pandas" not in sys.modules:
-    sys.modules["pandas"] = types.ModuleType("pandas")
-if "sqlalchemy" not in sys.modules:
-    sa_mod = types.ModuleType("sqlalchemy")
-    sa_mod.types = types.SimpleNamespace(Text=lambda *a, **k: None)
-    sys.modules["sqlalchemy"] = sa_mod
-    sys.modules["sqlalchemy.types"] = sa_mod.types
-if "tqdm" not in sys.modules:
-    dummy = types.ModuleType("tqdm")
-    dummy.tqdm = lambda it, **kw: it
-    sys.modules["tqdm"] = dummy
-if "pyodbc" not in sys.modules:
-    class _DummyError(Exception):
-        pass
-    sys.modules["pyodbc"] = types.SimpleNamespace(Error=_DummyError)
-if "dotenv" not in sys.modules:
-    mod = types.ModuleType("dotenv")
-    mod.load_dotenv = lambda *a, **k: None
-    sys.modules["dotenv"] = mod
-if "mysql" not in sys.modules:
-    dummy_mysql = types.ModuleType("mysql")
-    dummy_mysql.connector = types.SimpleNamespace(connect=lambda **k: None)
-    sys.modules["mysql"] = dummy_mysql
-    sys.modules["mysql.connector"] = dummy_mysql.connector
 
 from etl.base_importer import BaseDBImporter
 import db.mssql as mssql
@@ -59,6 +30,9 @@ class MiniImporter(BaseDBImporter):
     def execute_preprocessing(self, conn):
         conn.execute("CREATE TABLE numbers (id INTEGER PRIMARY KEY, num INTEGER)")
 
+    def configure_target_connection(self, conn):
+        pass  # sqlite has no SET LOCK_TIMEOUT
+
     def prepare_drop_and_select(self, conn):
         pass
 
@@ -0,0 +1,161 @@
+import importlib.util
+import types
+from pathlib import Path
+
+import pytest
+
+from utils.etl_helpers import flush_error_log
+
+LOB_COLUMNS_PATH = Path(__file__).resolve().parents[1] / "04_LOBColumns.py"
+
+CATALOG_COLUMNS = ("SchemaName", "TableName", "ColumnName", "DataType", "CurrentLength", "RowCnt")
+
+
+@pytest.fixture(scope="module")
+def lob_columns():
+    spec = importlib.util.spec_from_file_location("lob_columns", LOB_COLUMNS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class LobCursor:
+    """Cursor double behaving like pyodbc against SQL Server.
+
+    ``execute`` takes no timeout keyword, leaving the ``with`` block commits
+    when autocommit is off, a commit closes any open result set, and a
+    connection refuses a new statement while another cursor still has
+    unread rows (no MARS).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self.rows = None
+        self.arraysize = 1
+        self.fast_executemany = False
+
+    def execute(self, sql, params=None):
+        if any(other.rows for other in self.conn.cursors if other is not self):
+            raise RuntimeError("Connection is busy with results for another command")
+        self.description = None
+        self.rows = None
+        if "sys.tables" in sql:
+            self.description = tuple((name,) for name in CATALOG_COLUMNS)
+            self.rows = list(self.conn.catalog)
+        elif "Alter_Statement" in sql:
+            self.description = (("Alter_Statement",),)
+            self.rows = [(stmt,) for stmt in self.conn.alter_statements]
+        elif sql.lstrip().startswith("ALTER"):
+            self.conn.pending.append(sql)
+        elif "MAX(LEN" in sql:
+            self.description = (("len",),)
+            self.rows = [(10,)]
+        elif sql.lstrip().startswith("INSERT"):
+            if params[2] == self.conn.bad_column:
+                raise RuntimeError("duplicate key")
+            self.conn.pending.append(params)
+
+    def executemany(self, sql, seq_of_params):
+        for params in seq_of_params:
+            self.execute(sql, params)
+
+    def _fetch(self, size):
+        if self.rows is None:
+            raise RuntimeError("Invalid cursor state")
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchone(self):
+        rows = self._fetch(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=None):
+        return self._fetch(size or self.arraysize)
+
+    def fetchall(self):
+        return self._fetch(len(self.rows or ()))
+
+    def close(self):
+        self.rows = None
+        self.conn.cursors.remove(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.conn.autocommit:
+            self.conn.commit()
+
+
+class LobConn:
+    def __init__(self, catalog=(), bad_column=None, alter_statements=()):
+        self.catalog = catalog
+        self.bad_column = bad_column
+        self.alter_statements = alter_statements
+        # get_target_connection() leaves autocommit off
+        self.autocommit = False
+        self.cursors = []
+        self.pending = []
+        self.inserted = []
+
+    def cursor(self):
+        cursor = LobCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+    def _end_transaction(self):
+        self.pending = []
+        # SQL Server closes open cursors at the end of a transaction
+        for cursor in self.cursors:
+            cursor.rows = None
+
+    def commit(self):
+        self.inserted.extend(self.pending)
+        self._end_transaction()
+
+    def rollback(self):
+        self._end_transaction()
+
+
+def _run_gather(module, monkeypatch, conn, log_file):
+    progress = types.SimpleNamespace(update=lambda n: None, close=lambda: None)
+    monkeypatch.setattr(module, "tqdm", lambda *args, **kwargs: progress)
+    config = {"include_empty_tables": False, "sql_timeout": 5, "batch_size": 10}
+    module.gather_lob_columns(conn, config, str(log_file))
+
+
+def test_load_config_ignores_missing_file(lob_columns, tmp_path):
+    config = lob_columns.load_config(str(tmp_path / "missing.json"))
+    assert config["sql_timeout"] == lob_columns.ETLConstants.DEFAULT_SQL_TIMEOUT
+
+    path = tmp_path / "config.json"
+    path.write_text('{"sql_timeout": 7}', encoding="utf-8")
+    assert lob_columns.load_config(str(path))["sql_timeout"] == 7
+
+
+def test_gather_lob_columns_inserts_catalog_rows(lob_columns, monkeypatch, tmp_path):
+    catalog = [("dbo", "t", f"c{i}", "varchar", -1, 5) for i in range(3)]
+    conn = LobConn(catalog)
+    _run_gather(lob_columns, monkeypatch, conn, tmp_path / "errors.txt")
+    assert [row[2] for row in conn.inserted] == ["c0", "c1", "c2"]
+    assert conn.inserted[0][6:] == (10, "ALTER TABLE [dbo].[t] ALTER COLUMN [c0] VARCHAR(10) NULL")
+
+
+def test_gather_lob_columns_retries_failed_batch_row_by_row(lob_columns, monkeypatch, tmp_path):
+    catalog = [("dbo", "t", f"c{i}", "varchar", -1, 5) for i in range(3)]
+    conn = LobConn(catalog, bad_column="c1")
+    log_file = tmp_path / "errors.txt"
+    _run_gather(lob_columns, monkeypatch, conn, log_file)
+    flush_error_log()
+    assert [row[2] for row in conn.inserted] == ["c0", "c2"]
+    assert "dbo.t.c1" in log_file.read_text()
+
+
+def test_execute_lob_column_updates_runs_each_alter(lob_columns, monkeypatch, tmp_path):
+    monkeypatch.setattr(lob_columns, "tqdm", lambda rows, **kwargs: rows)
+    alters = ["ALTER TABLE [dbo].[t] ALTER COLUMN [c0] VARCHAR(10);", "ALTER TABLE [dbo].[t] ALTER COLUMN [c1] TEXT;"]
+    conn = LobConn(alter_statements=alters)
+    config = {"sql_timeout": 5}
+    lob_columns.execute_lob_column_updates(conn, config, str(tmp_path / "errors.txt"))
+    assert conn.inserted == alters
@@ -0,0 +1,46 @@
+import contextvars
+import logging
+import threading
+
+from utils import logging_helper
+from utils.logging_helper import CidFormatter, correlation_id_var
+
+
+def test_cid_formatter_includes_correlation_id():
+    formatter = CidFormatter("[%(correlation_id)s] %(message)s")
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello", None, None)
+
+    token = correlation_id_var.set("abc123")
+    try:
+        assert formatter.format(record) == "[abc123] hello"
+    finally:
+        correlation_id_var.reset(token)
+
+    assert formatter.format(record) == "[-] hello"
+
+
+def test_flush_counts_aggregates_thread_counts(monkeypatch):
+    logging_helper.flush_counts()
+    monkeypatch.setattr(logging_helper, "operation_counts", {"success": 0, "failure": 0})
+
+    def worker():
+        for _ in range(3):
+            logging_helper.record_success()
+        logging_helper.record_failure()
+        logging_helper.flush_counts()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert logging_helper.flush_counts() == {"success": 12, "failure": 4}
+
+
+def test_setup_logging_sets_hex_correlation_id():
+    context = contextvars.copy_context()
+    cid = context.run(logging_helper.setup_logging)
+    assert len(cid) == 32
+    int(cid, 16)
+    assert context[correlation_id_var] == cid
@@ -1,15 +1,3 @@
-import sys, types
-if "mysql" not in sys.modules:
-    dummy_mysql = types.ModuleType("mysql")
-    dummy_mysql.connector = types.SimpleNamespace(connect=lambda **k: None)
-    sys.modules["mysql"] = dummy_mysql
-    sys.modules["mysql.connector"] = dummy_mysql.connector
-if "dotenv" not in sys.modules:
-    mod=types.ModuleType("dotenv")
-    mod.load_dotenv=lambda *a, **k: None
-    sys.modules["dotenv"] = mod
-if "pyodbc" not in sys.modules:
-    sys.modules["pyodbc"] = types.SimpleNamespace(connect=lambda *a, **k: None)
 import db.mssql as mssql
 
 class DummyConn:
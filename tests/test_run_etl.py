@@ -1,68 +1,30 @@
+import asyncio
 import os
+import queue
 import sys
 import types
 import json
-import importlib.util
-from pathlib import Path
-
-# Stub optional dependencies used by run_etl when importing
-if "tkinter" not in sys.modules:
-    tk = types.ModuleType("tkinter")
-    tk.Tk = object
-    tk.Label = object
-    tk.Entry = object
-    tk.Button = object
-    tk.Checkbutton = object
-    tk.Frame = object
-    tk.BooleanVar = object
-    tk.StringVar = object
-    tk.scrolledtext = types.SimpleNamespace(ScrolledText=object)
-    tk.messagebox = types.SimpleNamespace(showerror=lambda *a, **k: None,
-                                          showinfo=lambda *a, **k: None)
-    tk.filedialog = types.SimpleNamespace(askdirectory=lambda *a, **k: "")
-    sys.modules["tkinter"] = tk
-    sys.modules["tkinter.messagebox"] = tk.messagebox
-    sys.modules["tkinter.scrolledtext"] = tk.scrolledtext
-    sys.modules["tkinter.filedialog"] = tk.filedialog
-
-if "pyodbc" not in sys.modules:
-    class _DummyError(Exception):
-        pass
-    sys.modules["pyodbc"] = types.SimpleNamespace(Error=_DummyError, connect=lambda *a, **k: None)
-
-
-def _import_run_etl_from_repo(tmp_cwd):
-    """Import run_etl.py as if executed from a different directory."""
-    run_etl_path = Path(__file__).resolve().parents[1] / "run_etl.py"
-    spec = importlib.util.spec_from_file_location("run_etl", run_etl_path)
-    module = importlib.util.module_from_spec(spec)
-    cwd = os.getcwd()
-    os.chdir(tmp_cwd)
-    try:
-        spec.loader.exec_module(module)  # type: ignore
-    finally:
-        os.chdir(cwd)
-    return module
-
 
-def test_load_config_from_other_directory(tmp_path):
-    run_etl = _import_run_etl_from_repo(tmp_path)
 
+def test_load_config_from_other_directory(monkeypatch, tmp_path, run_etl):
     # Ensure CONFIG_FILE is absolute and points to the repo config directory
     assert os.path.isabs(run_etl.CONFIG_FILE)
     assert run_etl.CONFIG_FILE.endswith(os.path.join("config", "values.json"))
 
-    # Write a sample config file at the expected location
-    os.makedirs(os.path.dirname(run_etl.CONFIG_FILE), exist_ok=True)
-    with open(run_etl.CONFIG_FILE, "w") as f:
+    # Write a sample config file to a temporary location instead of the repo
+    config_file = tmp_path / "config" / "values.json"
+    monkeypatch.setattr(run_etl, "CONFIG_FILE", str(config_file))
+    config_file.parent.mkdir()
+    with open(config_file, "w") as f:
         json.dump({"driver": "dummy"}, f)
 
     config = run_etl.App._load_config(object())
     assert config.get("driver") == "dummy"
 
 
-def test_save_config_writes_absolute_path(tmp_path):
-    run_etl = _import_run_etl_from_repo(tmp_path)
+def test_save_config_writes_absolute_path(monkeypatch, tmp_path, run_etl):
+    config_file = tmp_path / "config" / "values.json"
+    monkeypatch.setattr(run_etl, "CONFIG_FILE", str(config_file))
 
     class DummyVar:
         def __init__(self, value):
@@ -78,14 +40,16 @@ def test_save_config_writes_absolute_path(tmp_path):
     )
 
     run_etl.App._save_config(dummy_app)
-    assert os.path.exists(run_etl.CONFIG_FILE)
-    with open(run_etl.CONFIG_FILE) as f:
+    assert config_file.exists()
+    with open(config_file) as f:
         data = json.load(f)
     assert data["csv_dir"] == "/tmp/csv"
 
 
-def test_show_script_widgets_preserves_order(monkeypatch, tmp_path):
+def test_show_script_widgets_preserves_order(monkeypatch, tmp_path, load_run_etl):
     """Buttons should be created in the order defined by ``SCRIPTS``."""
+    # App exports the checkbox value to the environment; restore it afterwards
+    monkeypatch.delenv("INCLUDE_EMPTY_TABLES", raising=False)
     # Build a minimal tkinter stub with the widget methods used by ``App``.
     class DummyWidget:
         def __init__(self, *a, **kw):
@@ -125,6 +89,8 @@ def test_show_script_widgets_preserves_order(monkeypatch, tmp_path):
             return self._v
         def set(self, val):
             self._v = val
+        def trace_add(self, *a, **k):
+            pass
 
     class DummyTk(DummyWidget):
         def title(self, *a, **k):
@@ -166,16 +132,15 @@ def test_show_script_widgets_preserves_order(monkeypatch, tmp_path):
                         types.SimpleNamespace(Error=Exception,
                                              connect=lambda *a, **k: None))
 
-    run_etl = _import_run_etl_from_repo(tmp_path)
+    run_etl = load_run_etl()
+    monkeypatch.setattr(run_etl, "CONFIG_FILE", str(tmp_path / "values.json"))
     app = run_etl.App()
     app._show_script_widgets()
 
-    assert list(app.run_buttons.keys()) == [p for _, p in run_etl.SCRIPTS]
-
+    assert list(app.run_buttons.keys()) == list(run_etl.SCRIPTS)
 
-def test_build_conn_str(tmp_path):
-    run_etl = _import_run_etl_from_repo(tmp_path)
 
+def test_build_conn_str(run_etl):
     class DummyEntry:
         def __init__(self, val):
             self._v = val
@@ -195,9 +160,29 @@ def test_build_conn_str(tmp_path):
     assert run_etl.App._build_conn_str(app) == 'DRIVER={SQL};SERVER=srv;DATABASE=db;UID=u;PWD=p'
 
 
-def test_run_sequential_etl_restores_env(monkeypatch, tmp_path):
-    run_etl = _import_run_etl_from_repo(tmp_path)
+def test_build_conn_str_omits_empty_optional_fields(run_etl):
+    class DummyEntry:
+        def __init__(self, val):
+            self._v = val
+        def get(self):
+            return self._v
+
+    app = types.SimpleNamespace(
+        entries={
+            'driver': DummyEntry(''),
+            'server': DummyEntry(''),
+            'database': DummyEntry('db'),
+            'user': DummyEntry(''),
+            'password': DummyEntry(''),
+        }
+    )
+
+    assert run_etl.App._build_conn_str(app) == (
+        'DRIVER={ODBC Driver 17 for SQL Server};SERVER=;DATABASE=db'
+    )
+
 
+def test_run_sequential_etl_restores_env(monkeypatch, run_etl):
     calls = []
     def make_mod(name, ret=True):
         mod = types.SimpleNamespace()
@@ -221,3 +206,29 @@ def test_run_sequential_etl_restores_env(monkeypatch, tmp_path):
 
     assert os.environ['FOO'] == 'old'
     assert calls == ['01', '02']
+
+
+def test_run_script_async_terminates_child_on_read_error(monkeypatch, tmp_path, run_etl):
+    script = tmp_path / 'long_line.py'
+    script.write_text("import time\nprint('x' * 1000, flush=True)\ntime.sleep(60)\n")
+    monkeypatch.setattr(run_etl, 'STREAM_LINE_LIMIT', 64)
+
+    processes = []
+    create = asyncio.create_subprocess_exec
+
+    async def recording_create(*args, **kwargs):
+        process = await create(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, 'create_subprocess_exec', recording_create)
+    output, status = queue.Queue(), queue.Queue()
+    asyncio.run(asyncio.wait_for(
+        run_etl.run_script_async(str(script), dict(os.environ), output, status), timeout=30
+    ))
+
+    assert processes[0].returncode is not None
+    statuses = []
+    while not status.empty():
+        statuses.append(status.get()[1])
+    assert statuses[-1] == 'EXECUTION ERROR'
@@ -1,39 +1,219 @@
 """Helper functions for executing SQL statements with logging and retries."""
 
+import atexit
 import logging
 import os
+import queue
+import random
+import re
+import threading
 import time
 from contextlib import contextmanager
-from typing import Any, Generator, List, Optional
+from functools import lru_cache, partial
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import (
+    Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Sequence,
+    TextIO, Tuple,
+)
 
 from utils.logging_helper import record_success, record_failure
 
 from config import ETLConstants
 
+# pyodbc's error class for the retry checks, resolved once at import.  Without
+# pyodbc an empty tuple makes the isinstance() checks always fail.
+try:
+    import pyodbc
+    _PYODBC_ERROR: Any = pyodbc.Error
+except ImportError:
+    _PYODBC_ERROR = ()
+
+
 class ETLError(Exception):
     """Base exception for ETL operations."""
 
 
 class SQLExecutionError(ETLError):
-    """Exception raised when SQL execution fails."""
+    """Exception raised when SQL execution fails.
+
+    The message is only formatted when the error is displayed, since retry
+    logic often catches and discards these errors.  ``args`` holds the
+    constructor arguments ``(sql, original_error, table_name)`` rather than
+    the message, so pickling (e.g. across process boundaries) can rebuild
+    the error through ``__init__``.
+    """
 
     def __init__(self, sql: str, original_error: Exception, table_name: Optional[str] = None):
         self.sql = sql
         self.original_error = original_error
         self.table_name = table_name
-        msg = f"SQL execution failed for {table_name or 'statement'}: {original_error}"
-        super().__init__(msg)
+        super().__init__(sql, original_error, table_name)
+
+    def __str__(self) -> str:
+        return f"SQL execution failed for {self.table_name or 'statement'}: {self.original_error}"
 
 logger = logging.getLogger(__name__)
 
+# Directory holding the SQL scripts, resolved once at import.
+SQL_SCRIPTS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sql_scripts')
+)
+
+# Hard coded source database name in the scripts, in both spellings used.
+_DB_NAME_RE = re.compile(r'E[lL]Paso_TX')
+
+# SQLSTATEs worth retrying: deadlock victim, timeouts and dropped or refused
+# connections.  Anything else (syntax errors, constraint violations) fails
+# the same way on every attempt.
+_TRANSIENT_SQLSTATES = frozenset({'40001', 'HYT00', 'HYT01', '08S01', '08001'})
+
+# Per-thread record of the connection whose session lock timeout was last
+# set and the value in milliseconds, as one (connection, ms) tuple.  A
+# connection keeps the setting, so repeating it is skipped.  pyodbc
+# connections cannot be weakly referenced, so the record holds the last
+# configured connection until another one replaces it.
+_lock_timeout_state = threading.local()
+
+# Tokens that start a literal or a comment, end a statement, or end a batch
+# (a line holding only GO) in a SQL script.
+_SCRIPT_TOKEN_RE = re.compile(r"'|\"|\[|--|/\*|;|^[ \t]*GO[ \t]*$", re.MULTILINE | re.IGNORECASE)
+_BLOCK_COMMENT_RE = re.compile(r"/\*|\*/")
+_QUOTE_CLOSERS = {"'": "'", '"': '"', '[': ']'}
+_NON_SPACE_RE = re.compile(r"\S")
+
+# Absolute SQL file path -> (mtime, content) of the last read.
+_sql_file_cache: Dict[str, Tuple[float, str]] = {}
+
+
+# Error log records waiting for the writer thread, as (log_path, time,
+# details) tuples, plus threading.Event markers queued by flush_error_log.
+_error_log_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+_error_log_thread: Optional[threading.Thread] = None
+_error_log_thread_lock = threading.Lock()
+
+# Error log files kept open by the writer thread, keyed by path.
+_error_log_files: Dict[str, TextIO] = {}
+
+# Last whole second formatted for the error log and its text; failures tend
+# to arrive in bursts within the same second.
+_last_log_second = -1
+_last_log_stamp = ''
+
+# Most records the writer takes from the queue before writing them out.
+_ERROR_LOG_BATCH_SIZE = 100
+
 
 def log_exception_to_file(error_details: str, log_path: str) -> None:
-    """Append exception details to a log file."""
-    try:
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {error_details}\n")
-    except Exception as file_exc:
-        logger.error(f"Failed to write to error log file: {file_exc}")
+    """Append exception details to a log file.
+
+    The record is handed to a background writer thread so the caller does
+    not wait on file I/O; use :func:`flush_error_log` to wait until it has
+    been written.
+    """
+    _start_error_log_writer()
+    _error_log_queue.put_nowait((log_path, time.time(), error_details))
+
+
+def flush_error_log() -> None:
+    """Block until every error log record queued so far has been written."""
+    if _error_log_thread is None:
+        return
+    # The writer sets the marker once it has written everything before it
+    written = threading.Event()
+    _error_log_queue.put(written)
+    written.wait()
+
+
+def _start_error_log_writer() -> None:
+    """Start the error log writer thread if it is not running yet."""
+    global _error_log_thread
+
+    if _error_log_thread is not None:
+        return
+    with _error_log_thread_lock:
+        if _error_log_thread is None:
+            thread = threading.Thread(
+                target=_error_log_writer, name="error-log-writer", daemon=True
+            )
+            thread.start()
+            _error_log_thread = thread
+            atexit.register(_close_error_log_files)
+
+
+def _close_error_log_files() -> None:
+    """Write any queued records, then close the open error log files."""
+    flush_error_log()
+    while _error_log_files:
+        _, log_file = _error_log_files.popitem()
+        try:
+            log_file.close()
+        except Exception as file_exc:
+            logger.error("Failed to close error log file: %s", file_exc)
+
+
+def _error_log_writer() -> None:
+    """Drain the error log queue, writing records in batches."""
+    while True:
+        batch: List[Tuple[str, float, str]] = []
+        markers: List[threading.Event] = []
+        item = _error_log_queue.get()
+        while True:
+            if isinstance(item, threading.Event):
+                markers.append(item)
+            else:
+                batch.append(item)
+                if len(batch) >= _ERROR_LOG_BATCH_SIZE:
+                    break
+            try:
+                item = _error_log_queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            if batch:
+                _write_error_log_batch(batch)
+        finally:
+            for marker in markers:
+                marker.set()
+
+
+def _format_log_time(timestamp: float) -> str:
+    """Format ``timestamp`` for the error log, reusing the last second's text."""
+    global _last_log_second, _last_log_stamp
+
+    second = int(timestamp)
+    if second != _last_log_second:
+        _last_log_stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+        _last_log_second = second
+    return _last_log_stamp
+
+
+def _write_error_log_batch(batch: List[Tuple[str, float, str]]) -> None:
+    """Append a batch of records to their log files and flush them.
+
+    Files stay open between batches; one that fails to write is closed and
+    reopened for the next batch.
+    """
+    lines_by_path: Dict[str, List[str]] = {}
+    for log_path, timestamp, error_details in batch:
+        stamp = _format_log_time(timestamp)
+        lines_by_path.setdefault(log_path, []).append(f"[{stamp}] {error_details}\n")
+
+    for log_path, lines in lines_by_path.items():
+        log_file = _error_log_files.get(log_path)
+        try:
+            if log_file is None:
+                log_file = _error_log_files[log_path] = open(log_path, "a", encoding="utf-8")
+            log_file.writelines(lines)
+            log_file.flush()
+        except Exception as file_exc:
+            logger.error("Failed to write to error log file: %s", file_exc)
+            broken = _error_log_files.pop(log_path, None)
+            if broken is not None:
+                try:
+                    broken.close()
+                except Exception:
+                    pass
 
 
 @contextmanager
@@ -56,6 +236,134 @@ def transaction_scope(conn: Any) -> Generator[Any, None, None]:
         raise
     finally:
         conn.autocommit = original_autocommit
+
+
+def _set_lock_timeout(conn: Any, cursor: Any, timeout: int) -> None:
+    """Set the session lock timeout to ``timeout`` seconds unless already set.
+
+    Only the most recently configured connection is remembered, which covers
+    the import scripts that run every step on one connection.  The record is
+    kept per thread and replaced as a whole, so a thread never pairs one
+    connection with a timeout set on another.
+    """
+    timeout_ms = timeout * 1000
+    last = getattr(_lock_timeout_state, "last", None)
+    if last is not None and last[0] is conn and last[1] == timeout_ms:
+        return
+    cursor.execute(f"SET LOCK_TIMEOUT {timeout_ms}")
+    _lock_timeout_state.last = (conn, timeout_ms)
+
+
+def configure_connection(conn: Any, timeout: int = ETLConstants.DEFAULT_SQL_TIMEOUT) -> None:
+    """Apply session settings to a new connection before running any steps.
+
+    Sets the lock timeout once, so helpers called with the same ``timeout``
+    on this connection do not send ``SET LOCK_TIMEOUT`` again.
+    """
+    cursor = conn.cursor()
+    try:
+        _set_lock_timeout(conn, cursor, timeout)
+    finally:
+        _close_cursor(cursor)
+
+
+def _close_cursor(cursor: Any) -> None:
+    """Close ``cursor`` if one was opened, ignoring errors from the driver.
+
+    Helpers close their cursor when they return rather than keeping it for
+    the next call; a kept cursor references its connection and would keep a
+    connection the caller has dropped open.
+    """
+    if cursor is None:
+        return
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=None)
+def _sql_script_index(scripts_dir: str) -> Dict[str, str]:
+    """Map every ``.sql`` file under ``scripts_dir`` to its absolute path.
+
+    Keys are relative paths with ``/`` separators, as callers pass them to
+    :func:`load_sql`.  The directory is walked once with ``os.scandir``.
+    """
+    index: Dict[str, str] = {}
+    pending = [(scripts_dir, '')]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as exc:
+            logger.error("Could not list SQL scripts in %s: %s", directory, exc)
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                pending.append((entry.path, f"{prefix}{entry.name}/"))
+            elif entry.name.endswith('.sql'):
+                index[prefix + entry.name] = entry.path
+    return index
+
+
+def _read_sql_file(sql_path: str) -> str:
+    """Return the contents of ``sql_path``, reading it only when it changed.
+
+    The file is re-read when its modification time differs from the cached
+    one, so edits made while the ETL is running are still picked up.
+    """
+    try:
+        mtime = os.stat(sql_path).st_mtime
+    except FileNotFoundError:
+        logger.error("SQL file not found: %s", sql_path)
+        raise FileNotFoundError(f"SQL file not found: {sql_path}")
+
+    cached = _sql_file_cache.get(sql_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    # Read raw bytes in a single os.read sized from fstat, skipping the
+    # buffered file object, and translate newlines with bytes.replace, which
+    # is cheaper than text mode's incremental decoder; scripts checked out on
+    # Windows have CRLF endings and the GO splitting expects "\n".  The
+    # mtime is taken from the descriptor so it matches the bytes read.
+    fd = os.open(sql_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        st = os.fstat(fd)
+        data = os.read(fd, st.st_size)
+        # A file that grew since fstat, or a short read, is finished here
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    sql = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n').decode('utf-8')
+    _sql_file_cache[sql_path] = (st.st_mtime, sql)
+    return sql
+
+
+@lru_cache(maxsize=16)
+def _db_name_substituter(db_name: str) -> Callable[[str], str]:
+    """Return a function replacing the hard coded database name with ``db_name``.
+
+    Backslashes are escaped so the name is inserted literally, and the
+    replacement is bound once per target database.
+    """
+    return partial(_DB_NAME_RE.sub, db_name.replace('\\', '\\\\'))
+
+
+@lru_cache(maxsize=256)
+def _substitute_db_name(sql: str, db_name: str) -> str:
+    """Return ``sql`` targeting ``db_name``, memoized per script text and name.
+
+    ``sql`` is the text cached by :func:`_read_sql_file`, so while a file is
+    unchanged the lookup hits on the same string object.
+    """
+    return _db_name_substituter(db_name)(sql)
+
+
 def load_sql(filename: str, db_name: Optional[str] = None) -> str:
     """Load a SQL file from the sql_scripts directory.
 
@@ -70,32 +378,48 @@ def load_sql(filename: str, db_name: Optional[str] = None) -> str:
     Returns:
         SQL content with database name replaced if provided
     """
-    base_dir = os.path.dirname(os.path.dirname(__file__)) if '__file__' in globals() else os.getcwd()
-    scripts_dir = os.path.join(base_dir, 'sql_scripts')
-    # Normalize path to avoid path traversal outside sql_scripts
-    sql_path = os.path.abspath(os.path.normpath(os.path.join(scripts_dir, filename)))
+    sql_path = _sql_script_index(SQL_SCRIPTS_DIR).get(filename)
+    if sql_path is None:
+        # Not a script found at startup: normalize the path to avoid path
+        # traversal outside sql_scripts
+        sql_path = os.path.abspath(os.path.normpath(os.path.join(SQL_SCRIPTS_DIR, filename)))
 
-    # Ensure the final path is within the expected sql_scripts directory
-    scripts_dir_abs = os.path.abspath(scripts_dir)
-    if not sql_path.startswith(scripts_dir_abs + os.sep):
-        logger.error(f"Attempted SQL path traversal: {filename}")
-        raise ValueError(f"Invalid SQL file path: {filename}")
+        # Ensure the final path is within the expected sql_scripts directory
+        if not sql_path.startswith(SQL_SCRIPTS_DIR + os.sep):
+            logger.error("Attempted SQL path traversal: %s", filename)
+            raise ValueError(f"Invalid SQL file path: {filename}")
 
-    if not os.path.exists(sql_path):
-        logger.error(f"SQL file not found: {sql_path}")
-        raise FileNotFoundError(f"SQL file not found: {sql_path}")
-    
-    with open(sql_path, 'r', encoding='utf-8') as f:
-        sql = f.read()
+    sql = _read_sql_file(sql_path)
     
-    if db_name:
-        # Replace both variations of the database name
-        sql = sql.replace('ELPaso_TX', db_name).replace('ElPaso_TX', db_name)
-        logger.debug(f"Replaced database name in {filename} with {db_name}")
+    # Database names are case-insensitive on SQL Server, so either spelling
+    # of the hard coded name already targets the requested database
+    if db_name and not _DB_NAME_RE.fullmatch(db_name):
+        # Replace both variations of the database name in one pass
+        sql = _substitute_db_name(sql, db_name)
+        logger.debug("Replaced database name in %s with %s", filename, db_name)
     
     return sql
+
+
+def iter_rows(cursor: Any) -> Iterator[Any]:
+    """Yield the rows of the cursor's current result set.
+
+    Rows are fetched ``cursor.arraysize`` at a time so only one chunk is held
+    in memory while the caller processes it.
+    """
+    while True:
+        rows = cursor.fetchmany(cursor.arraysize)
+        if not rows:
+            return
+        yield from rows
+
+
 def run_sql_step(
-    conn: Any, name: str, sql: str, timeout: int = ETLConstants.DEFAULT_SQL_TIMEOUT
+    conn: Any,
+    name: str,
+    sql: str,
+    timeout: int = ETLConstants.DEFAULT_SQL_TIMEOUT,
+    keep_results: bool = True,
 ) -> Optional[List[Any]]:
     """Execute a single SQL statement and fetch any results.
     
@@ -104,35 +428,49 @@ def run_sql_step(
         name: Name of the step for logging
         sql: SQL statement to execute
         timeout: Query timeout in seconds
+        keep_results: If False, rows are streamed and counted but not kept
         
     Returns:
-        Query results if any, None otherwise
+        Query results if any and ``keep_results`` is set, None otherwise
     """
-    logger.info(f"Starting step: {name}")
+    logger.info("Starting step: %s", name)
     start_time = time.time()
+    cursor = None
     try:
-        with conn.cursor() as cursor:
-            # Set the query timeout
-            cursor.execute(f"SET LOCK_TIMEOUT {timeout * 1000}")  # Convert to milliseconds
-            cursor.execute(sql)
+        cursor = conn.cursor()
+        _set_lock_timeout(conn, cursor, timeout)
+        cursor.arraysize = ETLConstants.FETCH_BATCH_SIZE
+        cursor.execute(sql)
 
-            try:
-                results = cursor.fetchall()
-                logger.info(f"{name}: Retrieved {len(results)} rows")
-            except Exception:
+        # description is only set for statements that return rows
+        if cursor.description:
+            if keep_results:
+                results = list(iter_rows(cursor))
+                row_count = len(results)
+            else:
                 results = None
-                logger.info(f"{name}: Statement executed (no results to fetch)")
+                row_count = sum(1 for _ in iter_rows(cursor))
+            logger.info("%s: Retrieved %d rows", name, row_count)
+        else:
+            results = None
+            logger.info("%s: Statement executed (no results to fetch)", name)
+
+        # Leaving a pyodbc cursor's with block used to commit here
+        if not getattr(conn, "autocommit", True):
+            conn.commit()
 
         elapsed = time.time() - start_time
-        logger.info(f"Completed step: {name} in {elapsed:.2f} seconds")
+        logger.info("Completed step: %s in %.2f seconds", name, elapsed)
         record_success()
         return results
     except Exception as e:
         elapsed = time.time() - start_time
-        logger.error(f"Error executing step {name}: {e}. SQL: {sql}")
-        logger.info(f"Step {name} failed after {elapsed:.2f} seconds")
+        logger.error("Error executing step %s: %s. SQL: %s", name, e, sql)
+        logger.info("Step %s failed after %.2f seconds", name, elapsed)
         record_failure()
         raise SQLExecutionError(sql, e, table_name=name)
+    finally:
+        _close_cursor(cursor)
 
 
 def run_sql_step_with_retry(
@@ -142,75 +480,215 @@ def run_sql_step_with_retry(
     timeout: int = ETLConstants.DEFAULT_SQL_TIMEOUT,
     max_retries: int = ETLConstants.MAX_RETRY_ATTEMPTS,
 ) -> Optional[List[Any]]:
-    """Execute a SQL step with retry logic for transient ``pyodbc.Error`` failures."""
+    """Execute a SQL step with retry logic for transient ``pyodbc.Error`` failures.
 
+    Only errors whose SQLSTATE is in ``_TRANSIENT_SQLSTATES`` are retried;
+    the wait between attempts grows exponentially with a little random
+    jitter so parallel imports do not retry in lockstep.
+    """
     for attempt in range(max_retries):
         try:
             return run_sql_step(conn, name, sql, timeout)
         except SQLExecutionError as exc:
-            import pyodbc  # Imported lazily for tests that stub this module
-
-            if not isinstance(exc.original_error, pyodbc.Error):
+            error = exc.original_error
+            if not isinstance(error, _PYODBC_ERROR) or not _is_transient_error(error):
                 raise
 
             if attempt == max_retries - 1:
                 raise
 
-            if "timeout" in str(exc.original_error).lower():
-                logger.warning(
-                    f"Timeout on attempt {attempt + 1} for {name}, retrying..."
-                )
+            delay = min(2**attempt, 30) + random.uniform(0, 0.5)
+            logger.warning(
+                "Transient error (%s) on attempt %d for %s, retrying in %.1f seconds...",
+                error.args[0], attempt + 1, name, delay,
+            )
+            time.sleep(delay)
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Return ``True`` if ``error`` carries a SQLSTATE worth retrying."""
+    return bool(error.args) and error.args[0] in _TRANSIENT_SQLSTATES
+
+
+def _skip_quoted(text: str, pos: int, close: str) -> int:
+    """Return the index just past the quoted run closed by ``close``.
+
+    A doubled closing character (``''``, ``""`` or ``]]``) is an escape and
+    does not end the run.
+    """
+    while True:
+        end = text.find(close, pos)
+        if end == -1:
+            return len(text)
+        if text.startswith(close, end + 1):
+            pos = end + 2
+            continue
+        return end + 1
+
+
+def _skip_block_comment(text: str, pos: int) -> int:
+    """Return the index just past a ``/* */`` comment, honouring nesting."""
+    depth = 1
+    while depth:
+        match = _BLOCK_COMMENT_RE.search(text, pos)
+        if match is None:
+            return len(text)
+        depth += 1 if match.group() == '/*' else -1
+        pos = match.end()
+    return pos
+
+
+def _iter_statements(sql: str) -> Iterator[Tuple[int, str]]:
+    """Yield ``(batch_number, statement)`` for each statement in ``sql``.
+
+    The script is scanned once, jumping between the characters that can open
+    a string, bracketed identifier or comment, so semicolons and ``GO`` lines
+    inside them are ignored.  Statements end at ``;`` and batches at a line
+    holding only ``GO``; statements made up only of whitespace and comments
+    are skipped.
+    """
+    batch_number = 0
+    start = pos = 0
+    has_code = False
+    while True:
+        match = _SCRIPT_TOKEN_RE.search(sql, pos)
+        end = match.start() if match else len(sql)
+        # Searching in place avoids slicing out every gap between tokens
+        if not has_code and _NON_SPACE_RE.search(sql, pos, end):
+            has_code = True
+        if match is None:
+            break
+
+        token = match.group()
+        if token == '--':
+            newline = sql.find('\n', match.end())
+            pos = len(sql) if newline == -1 else newline
+        elif token == '/*':
+            pos = _skip_block_comment(sql, match.end())
+        elif token in _QUOTE_CLOSERS:
+            has_code = True
+            pos = _skip_quoted(sql, match.end(), _QUOTE_CLOSERS[token])
+        else:
+            # ';' ends a statement, a GO line also ends the batch
+            if has_code:
+                yield batch_number, sql[start:end].strip()
+            if token != ';':
+                batch_number += 1
+            start = pos = match.end()
+            has_code = False
+
+    if has_code:
+        yield batch_number, sql[start:].strip()
+
+
+@lru_cache(maxsize=64)
+def _split_script(sql: str) -> Tuple[Tuple[str, ...], ...]:
+    """Split a SQL script into ``GO`` batches of executable statements.
+
+    Batches left without statements are dropped.  The result is cached so
+    scripts run repeatedly are only parsed once.
+    """
+    return tuple(
+        tuple(stmt for _, stmt in group)
+        for _, group in groupby(_iter_statements(sql), key=itemgetter(0))
+    )
+
 
-            time.sleep(2**attempt)
 def run_sql_script(
-    conn: Any, name: str, sql: str, timeout: int = ETLConstants.DEFAULT_SQL_TIMEOUT
+    conn: Any,
+    name: str,
+    sql: str,
+    timeout: int = ETLConstants.DEFAULT_SQL_TIMEOUT,
+    batch_size: int = 1,
+    commit_every: int = 0,
 ) -> None:
     """Execute a multi-statement SQL script.
+
+    The script is committed once after all of its statements succeed, and
+    rolled back if anything fails.  ``autocommit`` is switched off for the
+    duration of the script so the driver does not commit each statement on
+    its own, and restored after the rollback, since turning it back on
+    commits any open transaction.  For very large scripts ``commit_every``
+    commits after that many ``GO`` batches instead, keeping the transaction
+    log small; a failure then only rolls back the batches since the last
+    commit.
+
+    With ``batch_size`` above one, up to that many statements of a ``GO``
+    batch are sent to the server in a single round trip.  Only use it for
+    scripts whose statements do not depend on schema changes made earlier
+    in the same round trip; a failure is then reported for the whole group.
     
     Args:
         conn: Database connection
         name: Name of the script for logging
         sql: SQL script containing multiple statements
         timeout: Query timeout in seconds for each statement
+        batch_size: Statements sent per round trip
+        commit_every: ``GO`` batches per commit, or 0 to commit once at the end
     """
-    logger.info(f"Starting script: {name}")
+    batches = _split_script(sql)
+
+    logger.info("Starting script: %s", name)
     start_time = time.time()
+    original_autocommit = getattr(conn, "autocommit", False)
+    finished = False
+    cursor = None
     try:
-        with conn.cursor() as cursor:
-            # Set the query timeout
-            cursor.execute(f"SET LOCK_TIMEOUT {timeout * 1000}")  # Convert to milliseconds
-
-            # Split by GO statements as well as semicolons for SQL Server
-            # This handles scripts that use GO as a batch separator
-            sql_batches = sql.split('\nGO\n') if '\nGO\n' in sql else [sql]
-
-            total_statements = 0
-            for batch in sql_batches:
-                statements = [stmt.strip() for stmt in batch.split(';') if stmt.strip()]
-                for stmt in statements:
-                    # Skip comments and empty statements
-                    if stmt and not stmt.strip().startswith('--'):
-                        try:
-                            cursor.execute(stmt)
-                            conn.commit()
-                            total_statements += 1
-                        except Exception as e:
-                            logger.error(f"Error executing script {name}: {e}. SQL: {stmt}")
-                            raise SQLExecutionError(stmt, e, table_name=name)
+        if original_autocommit:
+            conn.autocommit = False
+        cursor = conn.cursor()
+        _set_lock_timeout(conn, cursor, timeout)
+
+        total_statements = 0
+        round_trips = 0
+        for batch_number, statements in enumerate(batches, 1):
+            for start in range(0, len(statements), batch_size):
+                group = statements[start:start + batch_size]
+                stmt = group[0] if len(group) == 1 else ";\n".join(group)
+                try:
+                    cursor.execute(stmt)
+                    if len(group) > 1:
+                        # Errors from later statements surface while
+                        # stepping through their results
+                        while cursor.nextset():
+                            pass
+                    total_statements += len(group)
+                    round_trips += 1
+                except Exception as e:
+                    logger.error("Error executing script %s: %s. SQL: %s", name, e, stmt)
+                    raise SQLExecutionError(stmt, e, table_name=name)
+            if commit_every and batch_number % commit_every == 0:
+                conn.commit()
+        if not commit_every or len(batches) % commit_every:
+            conn.commit()
+        finished = True
 
         elapsed = time.time() - start_time
         logger.info(
-            f"Completed script: {name} - executed {total_statements} statements in {elapsed:.2f} seconds"
+            "Completed script: %s - executed %d statements (%d round trips) in %.2f seconds",
+            name, total_statements, round_trips, elapsed,
         )
         record_success()
     except SQLExecutionError:
         raise
     except Exception as e:
         elapsed = time.time() - start_time
-        logger.error(f"Error in script {name}: {e}")
-        logger.info(f"Script {name} failed after {elapsed:.2f} seconds")
+        logger.error("Error in script %s: %s", name, e)
+        logger.info("Script %s failed after %.2f seconds", name, elapsed)
         record_failure()
         raise SQLExecutionError(sql, e, table_name=name)
+    finally:
+        _close_cursor(cursor)
+        if not finished:
+            # Switching autocommit back on would commit the open transaction
+            try:
+                conn.rollback()
+            except Exception as e:
+                logger.warning("Rollback of script %s failed: %s", name, e)
+        if original_autocommit:
+            conn.autocommit = original_autocommit
+
+
 def execute_sql_with_timeout(
     conn: Any,
     sql: str,
@@ -231,8 +709,7 @@ def execute_sql_with_timeout(
     start_time = time.time()
     with conn.cursor() as cursor:
         try:
-            # Set the query timeout
-            cursor.execute(f"SET LOCK_TIMEOUT {timeout * 1000}")  # Convert to milliseconds
+            _set_lock_timeout(conn, cursor, timeout)
 
             if params:
                 cursor.execute(sql, params)
@@ -242,9 +719,66 @@ def execute_sql_with_timeout(
             record_success()
             return cursor
         except Exception as e:
-            logger.error(f"Error executing SQL: {e}. SQL: {sql}")
+            logger.error("Error executing SQL: %s. SQL: %s", e, sql)
             record_failure()
             raise SQLExecutionError(sql, e)
         finally:
             elapsed = time.time() - start_time
-            logger.debug(f"SQL executed in {elapsed:.2f} seconds")
+            logger.debug("SQL executed in %.2f seconds", elapsed)
+
+
+def execute_many_with_timeout(
+    conn: Any,
+    sql: str,
+    seq_of_params: Iterable[Sequence[Any]],
+    timeout: int = ETLConstants.DEFAULT_SQL_TIMEOUT,
+    batch_size: int = ETLConstants.EXECUTEMANY_BATCH_SIZE,
+) -> int:
+    """Execute a parameterized statement once for each set of parameters.
+
+    With pyodbc the parameter sets are sent ``batch_size`` at a time using
+    ``fast_executemany``, which packs each chunk into a single round trip
+    instead of one per row.  The driver binds every row with the parameter
+    types of the first, so all rows must use the same type in each position
+    (``None`` is allowed).  Nothing is committed here.
+
+    Args:
+        conn: Database connection
+        sql: Parameterized SQL statement to execute
+        seq_of_params: Parameter tuples, one per execution
+        timeout: Query timeout in seconds
+        batch_size: Parameter sets sent per round trip
+
+    Returns:
+        Number of parameter sets executed
+    """
+    start_time = time.time()
+    executed = 0
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        _set_lock_timeout(conn, cursor, timeout)
+        if hasattr(cursor, "fast_executemany"):
+            cursor.fast_executemany = True
+
+        params_iter = iter(seq_of_params)
+        while True:
+            chunk = list(islice(params_iter, batch_size))
+            if not chunk:
+                break
+            cursor.executemany(sql, chunk)
+            executed += len(chunk)
+
+        record_success()
+        return executed
+    except Exception as e:
+        logger.error(
+            "Error executing SQL in the chunk starting at parameter set %d: %s. SQL: %s",
+            executed, e, sql,
+        )
+        record_failure()
+        raise SQLExecutionError(sql, e)
+    finally:
+        _close_cursor(cursor)
+        elapsed = time.time() - start_time
+        logger.debug("SQL executed for %d parameter sets in %.2f seconds", executed, elapsed)
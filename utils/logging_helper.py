@@ -1,29 +1,62 @@
 """Logging utilities with correlation IDs and success/failure counters."""
 
 import logging
-import uuid
+import secrets
+import threading
 from contextvars import ContextVar
-from typing import Optional
+from typing import Dict
 
-correlation_id_var: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+# Shown in log lines emitted before setup_logging() assigns an ID.
+NO_CORRELATION_ID = "-"
 
-class CorrelationIdFilter(logging.Filter):
-    """Inject the correlation ID into all log records."""
+correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default=NO_CORRELATION_ID)
 
-    def filter(self, record: logging.LogRecord) -> bool:
-        if not hasattr(record, 'correlation_id'):
-            record.correlation_id = '-'  # Default value when not set
-        return True
+class CidFormatter(logging.Formatter):
+    """Formatter that adds the current correlation ID to each record.
 
+    Setting the ID while formatting avoids a separate filter pass per record
+    and only runs for records that are actually emitted.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.correlation_id = correlation_id_var.get()
+        return super().format(record)
+
+# Totals across threads; updated by flush_counts().
 operation_counts = {"success": 0, "failure": 0}
+_operation_counts_lock = threading.Lock()
+
+# Counts recorded by the current thread since its last flush.
+_thread_counts = threading.local()
+
+
+def _local_counts() -> Dict[str, int]:
+    counts = getattr(_thread_counts, "counts", None)
+    if counts is None:
+        counts = _thread_counts.counts = {"success": 0, "failure": 0}
+    return counts
 
 
 def record_success() -> None:
-    operation_counts["success"] += 1
+    _local_counts()["success"] += 1
 
 
 def record_failure() -> None:
-    operation_counts["failure"] += 1
+    _local_counts()["failure"] += 1
+
+
+def flush_counts() -> Dict[str, int]:
+    """Add the calling thread's counts to ``operation_counts`` and return it.
+
+    Each thread counts in its own dictionary without locking; call this from
+    a thread before it exits, and before reading the totals.
+    """
+    counts = _local_counts()
+    with _operation_counts_lock:
+        for key, value in counts.items():
+            operation_counts[key] += value
+            counts[key] = 0
+    return operation_counts
 
 
 def setup_logging(level: int = logging.INFO) -> str:
@@ -32,7 +65,7 @@ def setup_logging(level: int = logging.INFO) -> str:
     Returns the generated correlation ID so callers can include it elsewhere if
     needed.
     """
-    cid = uuid.uuid4().hex
+    cid = secrets.token_hex(16)
     correlation_id_var.set(cid)
 
     root = logging.getLogger()
@@ -40,16 +73,10 @@ def setup_logging(level: int = logging.INFO) -> str:
 
     if not root.handlers:
         handler = logging.StreamHandler()
-        formatter = logging.Formatter(
+        formatter = CidFormatter(
             "%(asctime)s [%(correlation_id)s] %(levelname)s %(name)s: %(message)s"
         )
         handler.setFormatter(formatter)
         root.addHandler(handler)
 
-    root.addFilter(CorrelationIdFilter())
-
-    # Add the filter to each handler
-    for handler in logging.root.handlers:
-        handler.addFilter(CorrelationIdFilter())
-
     return cid